@@ -6,20 +6,27 @@ usando FastAPI, Jinja2 e Bootstrap para uma interface moderna e intuitiva.
 """
 
 import os
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import FastAPI, Request, Form, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from jinja2 import FileSystemBytecodeCache
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, desc, asc
 
+from app.core.config import CONFIG
 from app.core.db_context import get_db
 from app.core.security.password import PasswordManager
 from app.models.db import UsuarioDb, DepartamentoDb, SalaDb, ReservaDb, RecursoSalaDb
 from app.models.enums import UserRole, RoomStatus, ReservationStatus
 
+# Opções de status exibidas nos formulários e filtros (constantes por processo)
+ROOM_STATUS_OPTIONS = tuple(status.value for status in RoomStatus)
+RESERVATION_STATUS_OPTIONS = tuple(status.value for status in ReservationStatus)
+
 
 class AdminAuth:
     """Sistema de autenticação para o painel administrativo."""
@@ -55,6 +62,11 @@ class AdminAuth:
             if not PasswordManager.verify_password(password, user.senha):
                 return False
 
+            # Migrar hashes legados (bcrypt) ou com parâmetros antigos
+            if PasswordManager.needs_rehash(user.senha):
+                user.senha = PasswordManager.hash_password(password)
+                db.commit()
+
             # Armazenar dados na sessão
             request.session.update(
                 {
@@ -95,17 +107,66 @@ class AdminAuth:
 class AdminDashboard:
     """Classe para gerenciar o dashboard administrativo."""
 
-    @staticmethod
-    def get_dashboard_stats(db: Session) -> Dict[str, Any]:
+    # Tempo (em segundos) durante o qual os contadores calculados são reutilizados
+    STATS_CACHE_TTL = 60
+    # Contadores em cache: (instante de expiração, contadores)
+    _stats_cache: Optional[Tuple[float, Dict[str, int]]] = None
+
+    @classmethod
+    def invalidate_stats_cache(cls) -> None:
+        """Descarta os contadores em cache (ex.: após alterar reservas)."""
+        cls._stats_cache = None
+
+    @classmethod
+    def get_dashboard_stats(cls, db: Session) -> Dict[str, Any]:
         """
         Obtém estatísticas para o dashboard.
 
+        Apenas os contadores (valores escalares) são mantidos em cache por
+        STATS_CACHE_TTL segundos; as últimas reservas e os novos usuários são
+        consultados a cada acesso, com a sessão da requisição atual.
+
         Args:
             db: Sessão do banco de dados
 
         Returns:
             Dict: Estatísticas do sistema
         """
+        cached = cls._stats_cache
+        if cached is not None and cached[0] > time.monotonic():
+            counts = cached[1]
+        else:
+            counts = cls._compute_dashboard_counts(db)
+            if counts is not None:
+                cls._stats_cache = (time.monotonic() + cls.STATS_CACHE_TTL, counts)
+            else:
+                # Valores padrão em caso de erro (não vão para o cache)
+                counts = {
+                    "total_users": 0,
+                    "total_departments": 0,
+                    "total_rooms": 0,
+                    "total_reservations": 0,
+                    "pending_reservations": 0,
+                    "active_rooms": 0,
+                }
+
+        return {
+            **counts,
+            "recent_reservations": cls._get_recent_reservations(db),
+            "recent_users": cls._get_recent_users(db),
+        }
+
+    @staticmethod
+    def _compute_dashboard_counts(db: Session) -> Optional[Dict[str, int]]:
+        """
+        Consulta o banco de dados para montar os contadores do dashboard.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            Optional[Dict]: Contadores do sistema, ou None em caso de erro
+        """
         try:
             # Contadores gerais
             total_users = db.query(func.count(UsuarioDb.id)).scalar() or 0
@@ -135,43 +196,9 @@ class AdminDashboard:
             except:
                 active_rooms = 0
 
-            # Últimas reservas
-            try:
-                recent_reservations = (
-                    db.query(ReservaDb)
-                    .options(joinedload(ReservaDb.usuario), joinedload(ReservaDb.sala))
-                    .order_by(desc(ReservaDb.criado_em))
-                    .limit(5)
-                    .all()
-                )
-            except:
-                recent_reservations = []
-
-            # Novos usuários
-            try:
-                recent_users = (
-                    db.query(UsuarioDb)
-                    .options(joinedload(UsuarioDb.departamento))
-                    .order_by(desc(UsuarioDb.criado_em))
-                    .limit(5)
-                    .all()
-                )
-            except:
-                recent_users = []
-
         except Exception as e:
             print(f"Erro ao obter estatísticas do dashboard: {e}")
-            # Retornar valores padrão em caso de erro
-            return {
-                "total_users": 0,
-                "total_departments": 0,
-                "total_rooms": 0,
-                "total_reservations": 0,
-                "pending_reservations": 0,
-                "active_rooms": 0,
-                "recent_reservations": [],
-                "recent_users": [],
-            }
+            return None
 
         return {
             "total_users": total_users,
@@ -180,10 +207,36 @@ class AdminDashboard:
             "total_reservations": total_reservations,
             "pending_reservations": pending_reservations,
             "active_rooms": active_rooms,
-            "recent_reservations": recent_reservations,
-            "recent_users": recent_users,
         }
 
+    @staticmethod
+    def _get_recent_reservations(db: Session) -> List[ReservaDb]:
+        """Últimas reservas, com usuário e sala já carregados."""
+        try:
+            return (
+                db.query(ReservaDb)
+                .options(joinedload(ReservaDb.usuario), joinedload(ReservaDb.sala))
+                .order_by(desc(ReservaDb.criado_em))
+                .limit(5)
+                .all()
+            )
+        except:
+            return []
+
+    @staticmethod
+    def _get_recent_users(db: Session) -> List[UsuarioDb]:
+        """Usuários criados mais recentemente, com o departamento já carregado."""
+        try:
+            return (
+                db.query(UsuarioDb)
+                .options(joinedload(UsuarioDb.departamento))
+                .order_by(desc(UsuarioDb.criado_em))
+                .limit(5)
+                .all()
+            )
+        except:
+            return []
+
 
 def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> FastAPI:
     """
@@ -202,6 +255,10 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
         templates_dir = os.path.join(os.path.dirname(__file__), "templates")
 
     templates = Jinja2Templates(directory=templates_dir)
+    # Reaproveitar os templates já compilados entre reinicializações/workers
+    templates.env.bytecode_cache = FileSystemBytecodeCache(pattern="salastech_admin_%s.cache")
+    # Em produção os templates não mudam em tempo de execução
+    templates.env.auto_reload = CONFIG.ENVIRONMENT != "production"
 
     # Montar diretório de arquivos estáticos
     static_dir = os.path.join(os.path.dirname(__file__), "static")
@@ -410,7 +467,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                 "request": request,
                 "title": "SalasTech Admin - Nova Sala",
                 "departments": departments,
-                "room_statuses": [status.value for status in RoomStatus],
+                "room_statuses": ROOM_STATUS_OPTIONS,
             },
         )
 
@@ -443,7 +500,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                         "request": request,
                         "title": "SalasTech Admin - Nova Sala",
                         "departments": departments,
-                        "room_statuses": [status.value for status in RoomStatus],
+                        "room_statuses": ROOM_STATUS_OPTIONS,
                         "error_message": f"Já existe uma sala com o código '{codigo}'.",
                     },
                     status_code=400,
@@ -479,7 +536,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "request": request,
                     "title": "SalasTech Admin - Nova Sala",
                     "departments": departments,
-                    "room_statuses": [status.value for status in RoomStatus],
+                    "room_statuses": ROOM_STATUS_OPTIONS,
                     "error_message": f"Valor inválido: {str(e)}",
                 },
                 status_code=400,
@@ -494,7 +551,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "request": request,
                     "title": "SalasTech Admin - Nova Sala",
                     "departments": departments,
-                    "room_statuses": [status.value for status in RoomStatus],
+                    "room_statuses": ROOM_STATUS_OPTIONS,
                     "error_message": f"Erro ao criar sala: {str(e)}",
                 },
                 status_code=500,
@@ -576,7 +633,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                 "title": f"SalasTech Admin - Editar Sala {room.nome}",
                 "room": room,
                 "departments": departments,
-                "room_statuses": [status.value for status in RoomStatus],
+                "room_statuses": ROOM_STATUS_OPTIONS,
             },
         )
 
@@ -622,7 +679,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                         "title": f"SalasTech Admin - Editar Sala {room.nome}",
                         "room": room,
                         "departments": departments,
-                        "room_statuses": [status.value for status in RoomStatus],
+                        "room_statuses": ROOM_STATUS_OPTIONS,
                         "error_message": f"Já existe outra sala com o código '{codigo}'.",
                     },
                     status_code=400,
@@ -655,7 +712,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "title": f"SalasTech Admin - Editar Sala {room.nome}",
                     "room": room,
                     "departments": departments,
-                    "room_statuses": [status.value for status in RoomStatus],
+                    "room_statuses": ROOM_STATUS_OPTIONS,
                     "error_message": f"Valor inválido: {str(e)}",
                 },
                 status_code=400,
@@ -671,7 +728,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "title": f"SalasTech Admin - Editar Sala {room.nome}",
                     "room": room,
                     "departments": departments,
-                    "room_statuses": [status.value for status in RoomStatus],
+                    "room_statuses": ROOM_STATUS_OPTIONS,
                     "error_message": f"Erro ao atualizar sala: {str(e)}",
                 },
                 status_code=500,
@@ -1155,7 +1212,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                 user.senha = PasswordManager.hash_password(senha)
 
             # Atualizar usuário no banco
-            user.atualizado_em = datetime.utcnow()
+            user.atualizado_em = func.now()
             db.commit()
 
             return RedirectResponse(
@@ -1268,7 +1325,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
             query = query.filter(ReservaDb.sala_id == room_id)
 
             # Buscar a sala para exibir informações dela
-            room = db.query(SalaDb).filter(SalaDb.id == room_id).first()
+            room = db.get(SalaDb, room_id)
             if not room:
                 return RedirectResponse(url="/admin/rooms", status_code=302)
         else:
@@ -1306,7 +1363,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                 "total": total,
                 "room_id": room_id,
                 "status_filter": status_filter,
-                "reservation_statuses": [status.value for status in ReservationStatus],
+                "reservation_statuses": RESERVATION_STATUS_OPTIONS,
             },
         )
 
@@ -1340,9 +1397,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "rooms": rooms,
                     "users": users,
                     "room_id": room_id,
-                    "reservation_statuses": [
-                        status.value for status in ReservationStatus
-                    ],
+                    "reservation_statuses": RESERVATION_STATUS_OPTIONS,
                 },
             )
 
@@ -1440,6 +1495,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
 
             db.add(nova_reserva)
             db.commit()
+            AdminDashboard.invalidate_stats_cache()
 
             return RedirectResponse(
                 url=f"/admin/reservations{'?room_id=' + str(room_id) if room_id else ''}",
@@ -1468,9 +1524,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "rooms": rooms,
                     "users": users,
                     "room_id": room_id,
-                    "reservation_statuses": [
-                        status.value for status in ReservationStatus
-                    ],
+                    "reservation_statuses": RESERVATION_STATUS_OPTIONS,
                     "error_message": f"Erro ao criar reserva: {str(e)}",
                 },
                 status_code=400,
@@ -1517,9 +1571,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "reservation": reservation,
                     "rooms": rooms,
                     "users": users,
-                    "reservation_statuses": [
-                        status.value for status in ReservationStatus
-                    ],
+                    "reservation_statuses": RESERVATION_STATUS_OPTIONS,
                 },
             )
 
@@ -1623,6 +1675,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
             reservation.atualizado_em = datetime.now()
 
             db.commit()
+            AdminDashboard.invalidate_stats_cache()
 
             return RedirectResponse(url="/admin/reservations", status_code=302)
 
@@ -1655,9 +1708,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                     "reservation": reservation,
                     "rooms": rooms,
                     "users": users,
-                    "reservation_statuses": [
-                        status.value for status in ReservationStatus
-                    ],
+                    "reservation_statuses": RESERVATION_STATUS_OPTIONS,
                     "error_message": f"Erro ao atualizar reserva: {str(e)}",
                 },
                 status_code=400,
@@ -1694,6 +1745,7 @@ def setup_admin_routes(app: FastAPI, templates_dir: Optional[str] = None) -> Fas
                 raise ValueError("Ação inválida")
 
             db.commit()
+            AdminDashboard.invalidate_stats_cache()
 
             # Redirecionar de volta para a lista
             return RedirectResponse(url=f"/admin/reservations", status_code=302)
@@ -10,6 +10,7 @@ from ...core.security.auth import JWTManager
 from ...core.security.password import PasswordManager
 from ...core.security.middleware import get_current_user
 from ...core.dependencies import get_user_service
+from ...models.db import UsuarioDb
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,11 @@ async def login(
     """
     try:
         # Get user by email
-        user = user_service.obter_por_email(credentials.email)
+        user = (
+            user_service.query(UsuarioDb)
+            .filter(UsuarioDb.email == credentials.email)
+            .first()
+        )
         if not user:
             logger.warning(f"Login attempt with non-existent email: {credentials.email}")
             raise HTTPException(
@@ -76,6 +81,11 @@ async def login(
                 detail="Invalid email or password"
             )
         
+        # Migrate legacy (bcrypt) or outdated hashes
+        if PasswordManager.needs_rehash(user.senha):
+            user.senha = PasswordManager.hash_password(credentials.password)
+            user_service.commit()
+        
         # Create JWT tokens
         tokens = JWTManager.create_tokens(
             user_id=str(user.id),
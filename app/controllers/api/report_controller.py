@@ -1,3 +1,4 @@
+from collections import Counter
 from datetime import datetime
 from typing import Optional
 
@@ -41,15 +42,16 @@ def generate_usage_report(
     usage_data = {}
     for reserva in reservas:
         sala_id = reserva.sala_id
-        if sala_id not in usage_data:
-            usage_data[sala_id] = {
+        dados_sala = usage_data.get(sala_id)
+        if dados_sala is None:
+            dados_sala = usage_data[sala_id] = {
                 "sala_id": sala_id,
                 "total_reservas": 0,
                 "total_horas": 0
             }
-        usage_data[sala_id]["total_reservas"] += 1
+        dados_sala["total_reservas"] += 1
         # TODO: Calcular horas reais baseado em inicio e fim
-        usage_data[sala_id]["total_horas"] += 1
+        dados_sala["total_horas"] += 1
     
     return list(usage_data.values())
 
@@ -72,15 +74,18 @@ def generate_occupancy_report(
         ReservaDb.fim_data_hora <= end_date
     ).all()
     
+    # Agrupar reservas por sala em uma única passagem
+    reservas_por_sala = Counter(r.sala_id for r in reservas)
+    
     # Calcular ocupação por sala
     occupancy_data = []
     for sala in salas:
-        sala_reservas = [r for r in reservas if r.sala_id == sala.id]
+        total_reservas = reservas_por_sala[sala.id]
         occupancy_data.append({
             "sala_id": sala.id,
             "nome_sala": sala.nome,
-            "total_reservas": len(sala_reservas),
-            "taxa_ocupacao": len(sala_reservas) * 0.1  # Placeholder
+            "total_reservas": total_reservas,
+            "taxa_ocupacao": total_reservas * 0.1  # Placeholder
         })
     
     return occupancy_data
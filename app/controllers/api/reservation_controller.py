@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.models import dto
 from app.models import enums
 from app.models.db import ReservaDb, SalaDb, UsuarioDb
+from app.admin.config import AdminDashboard
 from app.core.db_context import get_db
 from app.core.security.middleware import get_current_user, get_admin_user
 
@@ -17,6 +18,9 @@ router = APIRouter(
     tags=["Reservas"]
 )
 
+# Papéis que podem editar ou cancelar reservas de outros usuários
+_ADMIN_ROLES = frozenset({enums.UserRole.ADMIN, enums.UserRole.ADMINISTRADOR})
+
 @router.get("", response_model=list[dto.ReservaRespostaDTO])
 def get_all(
     limit: int = Query(1000, gt=0),
@@ -106,6 +110,7 @@ def create_reservation(
     )
     db.add(reserva_db)
     db.commit()
+    AdminDashboard.invalidate_stats_cache()
     db.refresh(reserva_db)
     return dto.ReservaRespostaDTO.from_orm(reserva_db)
 
@@ -126,7 +131,7 @@ def update_reservation(
         raise HTTPException(status_code=404, detail="Reserva não encontrada")
     
     # Verificar se o usuário pode editar esta reserva
-    if reserva.usuario_id != user_id and current_user["role"] not in ["admin", "administrador"]:
+    if reserva.usuario_id != user_id and current_user["role"] not in _ADMIN_ROLES:
         raise HTTPException(status_code=403, detail="Sem permissão para editar esta reserva")
     
     # Atualizar campos
@@ -134,6 +139,7 @@ def update_reservation(
         setattr(reserva, field, value)
     
     db.commit()
+    AdminDashboard.invalidate_stats_cache()
     db.refresh(reserva)
     return dto.ReservaRespostaDTO.from_orm(reserva)
 
@@ -154,11 +160,12 @@ def cancel_reservation(
         raise HTTPException(status_code=404, detail="Reserva não encontrada")
     
     # Verificar se o usuário pode cancelar esta reserva
-    if reserva.usuario_id != user_id and current_user["role"] not in ["admin", "administrador"]:
+    if reserva.usuario_id != user_id and current_user["role"] not in _ADMIN_ROLES:
         raise HTTPException(status_code=403, detail="Sem permissão para cancelar esta reserva")
     
     reserva.status = enums.ReservationStatus.CANCELADA
     db.commit()
+    AdminDashboard.invalidate_stats_cache()
 
 @router.get("/room/{room_id}", response_model=list[dto.ReservaRespostaDTO])
 def get_by_room(
@@ -19,6 +19,7 @@ class Config:
     COOKIES_KEY_NAME: str
     SESSION_TIME: timedelta
     HASH_SALT: str
+    ENVIRONMENT: str = "development"
 
     @staticmethod
     def get_config() -> Config:
@@ -58,8 +59,9 @@ class Config:
         cookies_key_name = "session_token"
         session_time = timedelta(days=30)
         hash_salt = getenv("HASH_SALT", "SomeRandomStringHere")
+        environment = getenv("ENVIRONMENT", "development").lower()
 
-        return Config(db_connection_string, db_type, cookies_key_name, session_time, hash_salt)
+        return Config(db_connection_string, db_type, cookies_key_name, session_time, hash_salt, environment)
 
 
 CONFIG = Config.get_config()
@@ -1,68 +1,104 @@
 """
-Simplified password hashing using bcrypt only
+Password hashing using Argon2id, with transparent support for legacy bcrypt hashes
 """
 import bcrypt
 import logging
+import secrets
+import time
 from typing import Optional
 
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+
 logger = logging.getLogger(__name__)
 
+# Shared Argon2id hasher, configured once per process
+# Parameters: 3 iterations, 64 MiB of memory, 4 lanes
+_password_hasher = PasswordHasher(
+    time_cost=3,
+    memory_cost=65536,
+    parallelism=4,
+    type=Type.ID,
+)
+
+# Prefix shared by all bcrypt hashes ($2a$, $2b$, $2y$)
+_BCRYPT_PREFIX = "$2"
+
 
 class PasswordManager:
-    """Unified password management using bcrypt"""
-    
+    """Unified password management using Argon2id"""
+
     @staticmethod
     def hash_password(password: str) -> str:
         """
-        Hash password using bcrypt with automatic salt generation
-        
+        Hash password using Argon2id with automatic salt generation
+
         Args:
             password: Plain text password
-            
+
         Returns:
-            str: Hashed password
+            str: Encoded Argon2id hash ($argon2id$...)
         """
         try:
-            # Generate salt and hash password
-            salt = bcrypt.gensalt()
-            hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-            return hashed.decode('utf-8')
+            return _password_hasher.hash(password)
         except Exception as e:
             logger.error(f"Error hashing password: {e}")
             raise ValueError("Failed to hash password")
-    
+
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
         """
         Verify password against hash
-        
+
+        Legacy bcrypt hashes are still accepted; use `needs_rehash` after a
+        successful login to migrate them to Argon2id.
+
         Args:
             password: Plain text password
             hashed: Hashed password from database
-            
+
         Returns:
             bool: True if password matches, False otherwise
         """
         try:
-            return bcrypt.checkpw(
-                password.encode('utf-8'), 
-                hashed.encode('utf-8')
-            )
+            if hashed.startswith(_BCRYPT_PREFIX):
+                return bcrypt.checkpw(
+                    password.encode('utf-8'),
+                    hashed.encode('utf-8')
+                )
+            return _password_hasher.verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
         except Exception as e:
             logger.warning(f"Error verifying password: {e}")
             return False
-    
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """
+        Check whether a stored hash should be replaced by a new one
+
+        Args:
+            hashed: Hashed password from database
+
+        Returns:
+            bool: True for legacy bcrypt hashes or outdated Argon2 parameters
+        """
+        if hashed.startswith(_BCRYPT_PREFIX):
+            return True
+        try:
+            return _password_hasher.check_needs_rehash(hashed)
+        except InvalidHashError:
+            return True
+
     @staticmethod
     def generate_random_hash() -> str:
         """
         Generate a random hash for tokens/identifiers
-        
+
         Returns:
             str: Random hash
         """
-        import secrets
-        import time
-        
         # Generate random bytes with timestamp
         random_data = f"{time.time()}{secrets.token_hex(16)}"
         return PasswordManager.hash_password(random_data)
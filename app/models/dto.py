@@ -220,10 +220,15 @@ class TokenDTO(BaseModel):
 
     Atributos:
         usuario_id (int): ID do usuário associado ao token.
-        papel (str): Papel do usuário associado ao token.
+        papel (UserRole): Papel do usuário associado ao token.
     """
     usuario_id: int
-    papel: str
+    papel: UserRole
+
+    class Config:
+        """Configurações do Pydantic para este modelo."""
+        use_enum_values = True # Serializa o papel como string, preservando o formato do JWT
+        frozen = True # O token é imutável após a criação
 
 # DEPARTAMENTO
 class DepartamentoBaseDTO(BaseModel):
@@ -5,12 +5,13 @@ Este módulo contém funções auxiliares para validação de regras de negócio
 relacionadas a reservas, como verificação de horários de funcionamento,
 cálculo de duração, verificação de feriados, etc.
 """
-from datetime import datetime, timedelta, time
-from typing import Tuple, Optional, List
+from datetime import date, datetime, timedelta, time
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Tuple, Optional, List
 
 # Lista de feriados nacionais (formato: MM-DD)
 # Esta lista deve ser atualizada anualmente ou obtida de uma API externa
-FERIADOS_NACIONAIS = [
+FERIADOS_NACIONAIS = frozenset({
     "01-01",  # Ano Novo
     "04-21",  # Tiradentes
     "05-01",  # Dia do Trabalho
@@ -19,19 +20,63 @@ FERIADOS_NACIONAIS = [
     "11-02",  # Finados
     "11-15",  # Proclamação da República
     "12-25",  # Natal
-]
+})
 
-# Horários de funcionamento por dia da semana
+
+@lru_cache(maxsize=8)
+def _holidays_for_year(year: int) -> FrozenSet[date]:
+    """
+    Retorna as datas dos feriados nacionais de um ano.
+
+    O resultado é memorizado por ano, evitando formatar a data com
+    `strftime` a cada verificação de feriado.
+    """
+    return frozenset(
+        date(year, int(mes), int(dia))
+        for mes, dia in (feriado.split("-") for feriado in FERIADOS_NACIONAIS)
+    )
+
+
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_MINUTE = 60 * 1_000_000
+
+
+class Horario(NamedTuple):
+    """Horário de funcionamento de um dia da semana."""
+    inicio: time
+    fim: time
+
+
+# Horários de funcionamento por dia da semana, indexados por weekday()
 # 0 = Segunda-feira, 6 = Domingo
-HORARIOS_FUNCIONAMENTO = {
-    0: {"inicio": time(7, 0), "fim": time(22, 0)},  # Segunda
-    1: {"inicio": time(7, 0), "fim": time(22, 0)},  # Terça
-    2: {"inicio": time(7, 0), "fim": time(22, 0)},  # Quarta
-    3: {"inicio": time(7, 0), "fim": time(22, 0)},  # Quinta
-    4: {"inicio": time(7, 0), "fim": time(22, 0)},  # Sexta
-    5: {"inicio": time(8, 0), "fim": time(18, 0)},  # Sábado
-    6: None,  # Domingo (fechado)
-}
+_HORARIOS: Tuple[Optional[Horario], ...] = (
+    Horario(time(7, 0), time(22, 0)),  # Segunda
+    Horario(time(7, 0), time(22, 0)),  # Terça
+    Horario(time(7, 0), time(22, 0)),  # Quarta
+    Horario(time(7, 0), time(22, 0)),  # Quinta
+    Horario(time(7, 0), time(22, 0)),  # Sexta
+    Horario(time(8, 0), time(18, 0)),  # Sábado
+    None,  # Domingo (fechado)
+)
+
+
+@lru_cache(maxsize=8)
+def _business_days(year: int) -> FrozenSet[date]:
+    """
+    Retorna os dias úteis (segunda a sexta, exceto feriados) de um ano.
+
+    Pré-calculado uma vez por ano para que a busca do próximo dia útil
+    seja uma simples consulta ao conjunto.
+    """
+    holidays = _holidays_for_year(year)
+    day = date(year, 1, 1)
+    one_day = timedelta(days=1)
+    business_days = set()
+    while day.year == year:
+        if day.weekday() < 5 and day not in holidays:
+            business_days.add(day)
+        day += one_day
+    return frozenset(business_days)
 
 
 def validate_business_hours(start_datetime: datetime, end_datetime: datetime) -> Tuple[bool, str]:
@@ -47,29 +92,25 @@ def validate_business_hours(start_datetime: datetime, end_datetime: datetime) ->
         - válido: True se estiver dentro do horário de funcionamento, False caso contrário
         - mensagem: Mensagem de erro em caso de invalidação
     """
+    # Verificar dia da semana (consulta mais barata, feita antes do feriado)
+    horario = _HORARIOS[start_datetime.weekday()]
+    if horario is None:
+        return False, "Não há funcionamento neste dia da semana"
+
     # Verificar se é feriado
     if is_holiday(start_datetime):
         return False, "Não é permitido fazer reservas em feriados"
 
-    # Verificar dia da semana
-    weekday = start_datetime.weekday()
-    if HORARIOS_FUNCIONAMENTO[weekday] is None:
-        return False, "Não há funcionamento neste dia da semana"
-
     # Verificar se o dia da semana é o mesmo para início e fim
     if start_datetime.date() != end_datetime.date():
         return False, "Reservas devem começar e terminar no mesmo dia"
 
     # Verificar horário de funcionamento
-    horario = HORARIOS_FUNCIONAMENTO[weekday]
-    start_time = start_datetime.time()
-    end_time = end_datetime.time()
-
-    if start_time < horario["inicio"]:
-        return False, f"Horário de início antes do horário de funcionamento ({horario['inicio'].strftime('%H:%M')})"
+    if start_datetime.time() < horario.inicio:
+        return False, f"Horário de início antes do horário de funcionamento ({horario.inicio.strftime('%H:%M')})"
 
-    if end_time > horario["fim"]:
-        return False, f"Horário de término após o horário de funcionamento ({horario['fim'].strftime('%H:%M')})"
+    if end_datetime.time() > horario.fim:
+        return False, f"Horário de término após o horário de funcionamento ({horario.fim.strftime('%H:%M')})"
 
     return True, ""
 
@@ -99,8 +140,7 @@ def is_holiday(date: datetime) -> bool:
     Returns:
         True se for feriado, False caso contrário
     """
-    date_str = date.strftime("%m-%d")
-    return date_str in FERIADOS_NACIONAIS
+    return date.date() in _holidays_for_year(date.year)
 
 
 def format_datetime(dt: datetime, format_str: str = "%d/%m/%Y %H:%M") -> str:
@@ -127,11 +167,12 @@ def get_next_business_day(date: datetime) -> datetime:
     Returns:
         Próximo dia útil
     """
-    next_day = date + timedelta(days=1)
+    one_day = timedelta(days=1)
+    next_day = date + one_day
     
-    # Verificar se é fim de semana
-    while next_day.weekday() > 4 or is_holiday(next_day):
-        next_day += timedelta(days=1)
+    # Avançar enquanto for fim de semana ou feriado
+    while next_day.date() not in _business_days(next_day.year):
+        next_day += one_day
     
     return next_day
 
@@ -154,45 +195,62 @@ def get_available_time_slots(
     Returns:
         Lista de slots disponíveis (início, fim)
     """
-    if occupied_slots is None:
-        occupied_slots = []
-    
     available_slots = []
     current_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = end_date.replace(hour=23, minute=59, second=59)
+    one_day = timedelta(days=1)
+    
+    # Os slots são calculados como inteiros (microssegundos desde o primeiro dia)
+    # e só são convertidos para datetime quando estão livres
+    reference = current_date
+    step = duration_minutes * _MICROSECONDS_PER_MINUTE
+    
+    # Ordenar os slots ocupados pelo início permite varrê-los com um ponteiro,
+    # já que os slots candidatos são gerados em ordem crescente
+    occupied = sorted(
+        ((occ_start - reference) // _MICROSECOND, (occ_end - reference) // _MICROSECOND)
+        for occ_start, occ_end in occupied_slots or []
+    )
+    total_occupied = len(occupied)
+    idx = 0
     
     # Para cada dia no intervalo
     while current_date <= end_date:
-        weekday = current_date.weekday()
+        horario = _HORARIOS[current_date.weekday()]
         
         # Verificar se o dia tem funcionamento
-        if HORARIOS_FUNCIONAMENTO[weekday] is not None and not is_holiday(current_date):
-            horario = HORARIOS_FUNCIONAMENTO[weekday]
-            
+        if horario is not None and not is_holiday(current_date):
             # Horário de início e fim do dia
-            day_start = datetime.combine(current_date.date(), horario["inicio"])
-            day_end = datetime.combine(current_date.date(), horario["fim"])
+            day_start = (datetime.combine(current_date.date(), horario.inicio) - reference) // _MICROSECOND
+            day_end = (datetime.combine(current_date.date(), horario.fim) - reference) // _MICROSECOND
             
             # Gerar slots para o dia
             slot_start = day_start
             while slot_start < day_end:
-                slot_end = slot_start + timedelta(minutes=duration_minutes)
-                if slot_end > day_end:
-                    slot_end = day_end
+                slot_end = min(slot_start + step, day_end)
+                
+                # Descartar os slots ocupados que terminam antes do slot atual
+                while idx < total_occupied and occupied[idx][1] <= slot_start:
+                    idx += 1
                 
                 # Verificar se o slot está ocupado
                 is_occupied = False
-                for occ_start, occ_end in occupied_slots:
-                    if (slot_start < occ_end and slot_end > occ_start):
+                j = idx
+                while j < total_occupied and occupied[j][0] < slot_end:
+                    if occupied[j][1] > slot_start:
                         is_occupied = True
                         break
+                    j += 1
                 
                 if not is_occupied:
-                    available_slots.append((slot_start, slot_end))
+                    available_slots.append((
+                        reference + timedelta(microseconds=slot_start),
+                        reference + timedelta(microseconds=slot_end),
+                    ))
                 
-                slot_start = slot_start + timedelta(minutes=duration_minutes)
+                slot_start += step
         
-        current_date += timedelta(days=1)
+        current_date += one_day
     
     return available_slots
 
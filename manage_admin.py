@@ -6,38 +6,92 @@ Este script (manage_admins.py) permite criar, listar, editar e excluir usuários
 que podem acessar o painel administrativo web do sistema.
 """
 
+from __future__ import annotations
+
 import os
+import re
 import sys
 import secrets
 import string
 import getpass
-import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-import datetime
+from typing import TYPE_CHECKING
 
 # Adicionar o diretório do projeto ao path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from sqlalchemy.orm import Session
-from app.core.db_context import SessionLocal
-from app.core.security.password import PasswordManager
-from app.models.db import UsuarioDb
-from app.models.enums import UserRole
+# SQLAlchemy e os modelos são importados nas funções que os utilizam, para que a
+# configuração do ORM e a criação do engine só ocorram quando o banco for acessado
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+# Linhas decorativas e menu, montados uma única vez na importação do módulo
+LINHA_TITULO = "🚀" + "=" * 40 + "🚀"
+LINHA_CABECALHO = "🚀" + "=" * 48 + "🚀"
+LINHA_DADOS = "📋" + "=" * 40 + "📋"
+LINHA_SUCESSO = "🎉" + "=" * 45 + "🎉"
+LINHA_CREDENCIAIS = "🔑" + "=" * 45 + "🔑"
+LINHA_ARQUIVO = "=" * 45
+LINHA_CELEBRACAO = "🎊" * 15
+LINHA_ERRO = "💥" * 15
+SEPARADOR_CURTO = "-" * 40
+SEPARADOR_MEDIO = "-" * 60
+SEPARADOR_LONGO = "-" * 70
+
+MENU_PRINCIPAL = "\n".join((
+    "\n" + LINHA_TITULO,
+    "      GERENCIAMENTO DE ADMINISTRADORES",
+    LINHA_TITULO,
+    "   1️⃣  Criar novo administrador",
+    "   2️⃣  Listar administradores",
+    "   3️⃣  Editar administrador",
+    "   4️⃣  Excluir administrador",
+    "   5️⃣  Sair",
+))
+
+# Cabeçalhos das tabelas de administradores
+CABECALHO_LISTAGEM = f"{'ID':<5} | {'Nome':<20} | {'Email':<25} | {'Criado em':<19}"
+CABECALHO_SELECAO = f"{'ID':<5} | {'Nome':<20} | {'Email':<25}"
+
+
+# Formato aceito para emails: usuario@dominio.tld, sem espaços e com um único "@"
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+# Sequência ANSI equivalente ao comando `clear`: cursor no início, limpa a tela e o histórico
+CLEAR_SCREEN_SEQUENCE = "\033[H\033[2J\033[3J"
 
 
 def clear_screen():
-    """Limpa a tela do terminal"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Limpa a tela do terminal (nada é escrito se a saída não for um terminal)"""
+    if not sys.stdout.isatty():
+        return
+    if os.name == 'nt':
+        # O console do Windows pode não interpretar sequências ANSI
+        os.system('cls')
+        return
+    sys.stdout.write(CLEAR_SCREEN_SEQUENCE)
+    sys.stdout.flush()
+
+
+def print_lines(linhas):
+    """Imprime um bloco de linhas com uma única escrita no terminal"""
+    print("\n".join(linhas))
 
 
 def print_header():
     """Imprime o cabeçalho da aplicação"""
     clear_screen()
-    print("🚀" + "=" * 48 + "🚀")
-    print("    SalasTech - Criador de Usuário Administrador")
-    print("🚀" + "=" * 48 + "🚀")
-    print()
+    print_lines((
+        LINHA_CABECALHO,
+        "    SalasTech - Criador de Usuário Administrador",
+        LINHA_CABECALHO,
+        "",
+    ))
 
 
 def generate_random_password(length=12):
@@ -61,15 +115,17 @@ def get_input_with_validation(prompt, validator=None, error_msg="Entrada inváli
 
 def validate_email(email):
     """Validação básica de email"""
-    return "@" in email and "." in email.split("@")[1]
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def get_password_choice():
     """Menu para escolha de senha"""
-    print("\n🔐 Configuração de Senha:")
-    print("   1️⃣  Digitar senha manualmente")
-    print("   2️⃣  Gerar senha aleatória segura")
-    print("   3️⃣  Usar senha padrão (admin123)")
+    print_lines((
+        "\n🔐 Configuração de Senha:",
+        "   1️⃣  Digitar senha manualmente",
+        "   2️⃣  Gerar senha aleatória segura",
+        "   3️⃣  Usar senha padrão (admin123)",
+    ))
     
     while True:
         choice = input("\n🎯 Escolha uma opção (1/2/3): ").strip()
@@ -110,47 +166,108 @@ def get_password_choice():
 
 def show_confirmation(dados):
     """Mostra dados para confirmação"""
-    print("\n" + "📋" + "=" * 40 + "📋")
-    print("           DADOS DO ADMINISTRADOR")
-    print("📋" + "=" * 40 + "📋")
-    print(f"   👤 Nome: {dados['nome']} {dados['sobrenome']}")
-    print(f"   📧 Email: {dados['email']}")
-    print(f"   🔑 Senha: {'*' * len(dados['senha'])}")
-    print(f"   👑 Papel: Administrador")
-    print("📋" + "=" * 40 + "📋")
+    print_lines((
+        "\n" + LINHA_DADOS,
+        "           DADOS DO ADMINISTRADOR",
+        LINHA_DADOS,
+        f"   👤 Nome: {dados['nome']} {dados['sobrenome']}",
+        f"   📧 Email: {dados['email']}",
+        f"   🔑 Senha: {'*' * len(dados['senha'])}",
+        f"   👑 Papel: Administrador",
+        LINHA_DADOS,
+    ))
+
+
+@contextmanager
+def atomic(db: Session):
+    """Agrupa as alterações de uma ação em uma única transação (um COMMIT, ou ROLLBACK em caso de erro)"""
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def get_admin_rows(db: Session):
+    """
+    Busca apenas as colunas exibidas dos administradores, sem carregar entidades ORM.
+    
+    As telas montam todas as linhas antes de imprimir (uma única escrita),
+    então o resultado é lido por completo.
+    """
+    from sqlalchemy import select
+    from app.models.db import UsuarioDb
+    from app.models.enums import UserRole
+    
+    return db.execute(
+        select(
+            UsuarioDb.id,
+            UsuarioDb.nome,
+            UsuarioDb.sobrenome,
+            UsuarioDb.email,
+            UsuarioDb.criado_em,
+        ).where(UsuarioDb.papel == UserRole.ADMIN)
+    )
+
+
+def parse_admin_id(value):
+    """Converte o ID digitado para inteiro, retornando None se não for numérico"""
+    try:
+        return int(value)
+    except ValueError:
+        print("❌ ID inválido! Digite apenas números.")
+        return None
+
+
+def get_admin_by_id(db: Session, admin_id: int):
+    """Busca um administrador pela chave primária (consulta primeiro o identity map da sessão)"""
+    from app.models.db import UsuarioDb
+    from app.models.enums import UserRole
+    
+    admin = db.get(UsuarioDb, admin_id)
+    if admin is None or admin.papel != UserRole.ADMIN:
+        return None
+    return admin
 
 
 def list_existing_admins(db):
     """Lista administradores existentes"""
-    admins = db.query(UsuarioDb).filter(UsuarioDb.papel == UserRole.ADMIN).all()
+    rows = [
+        f"   📧 {admin.email} - {admin.nome} {admin.sobrenome}"
+        for admin in get_admin_rows(db)
+    ]
     
-    if admins:
-        print("\n👥 Administradores existentes:")
-        print("-" * 40)
-        for admin in admins:
-            print(f"   📧 {admin.email} - {admin.nome} {admin.sobrenome}")
-        print("-" * 40)
-        return len(admins)
-    return 0
+    if not rows:
+        return 0
+    
+    linhas = ["\n👥 Administradores existentes:", SEPARADOR_CURTO]
+    linhas.extend(rows)
+    linhas.append(SEPARADOR_CURTO)
+    print_lines(linhas)
+    return len(rows)
 
 
 def save_credentials_to_file(dados, admin_user):
     """Salva credenciais em arquivo"""
     try:
         filename = f"admin_credentials_{admin_user.id}.txt"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("🚀 SalasTech - Credenciais do Administrador\n")
-            f.write("=" * 45 + "\n\n")
-            f.write(f"🌐 URL do Painel: http://localhost:8000/admin\n")
-            f.write(f"📧 Email: {dados['email']}\n")
-            f.write(f"🔑 Senha: {dados['senha']}\n")
-            f.write(f"👤 Nome: {dados['nome']} {dados['sobrenome']}\n")
-            f.write(f"🆔 ID: {admin_user.id}\n")
-            f.write(f"📅 Criado em: {admin_user.criado_em}\n\n")
-            f.write("⚠️  IMPORTANTE:\n")
-            f.write("- Guarde este arquivo em local seguro\n")
-            f.write("- Delete este arquivo após anotar as credenciais\n")
-            f.write("- Altere a senha após o primeiro login\n")
+        # Conteúdo montado de uma vez e gravado com uma única escrita
+        conteudo = (
+            "🚀 SalasTech - Credenciais do Administrador\n"
+            f"{LINHA_ARQUIVO}\n\n"
+            "🌐 URL do Painel: http://localhost:8000/admin\n"
+            f"📧 Email: {dados['email']}\n"
+            f"🔑 Senha: {dados['senha']}\n"
+            f"👤 Nome: {dados['nome']} {dados['sobrenome']}\n"
+            f"🆔 ID: {admin_user.id}\n"
+            f"📅 Criado em: {admin_user.criado_em}\n\n"
+            "⚠️  IMPORTANTE:\n"
+            "- Guarde este arquivo em local seguro\n"
+            "- Delete este arquivo após anotar as credenciais\n"
+            "- Altere a senha após o primeiro login\n"
+        )
+        Path(filename).write_text(conteudo, encoding="utf-8")
         
         print(f"💾 Credenciais salvas em: {filename}")
         return True
@@ -159,11 +276,74 @@ def save_credentials_to_file(dados, admin_user):
         return False
 
 
+def create_admins_bulk(db: Session, records):
+    """
+    Cria vários administradores de uma só vez, sem interação (ex.: provisionamento/CI).
+
+    As senhas são processadas em paralelo e todos os registros são inseridos em
+    um único INSERT ... RETURNING, sem carregar cada usuário de volta com refresh().
+    Bancos sem RETURNING em inserções múltiplas (ex.: MySQL) recebem um INSERT
+    simples, seguido de um SELECT dos registros criados pelos e-mails.
+
+    Args:
+        db: Sessão do banco de dados
+        records: Lista de dicionários com 'nome', 'sobrenome', 'email' e 'senha' (texto puro)
+
+    Returns:
+        Lista de linhas (id, email, criado_em) dos administradores criados
+    """
+    from sqlalchemy import insert, select
+    from app.core.security.password import PasswordManager
+    from app.models.db import UsuarioDb
+    from app.models.enums import UserRole
+    
+    records = list(records)
+    if not records:
+        # Um INSERT sem linhas de parâmetros viraria um INSERT só com os valores padrão
+        return []
+    
+    senhas = [record["senha"] for record in records]
+    
+    # O hash é CPU-bound e o argon2-cffi libera o GIL, então vários hashes
+    # podem ser calculados em paralelo; para um único registro não vale a pena
+    if len(senhas) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(senhas), os.cpu_count() or 1)) as executor:
+            hashes = list(executor.map(PasswordManager.hash_password, senhas))
+    else:
+        hashes = [PasswordManager.hash_password(senha) for senha in senhas]
+    
+    rows = [
+        {
+            "nome": record["nome"],
+            "sobrenome": record["sobrenome"],
+            "email": record["email"],
+            "senha": senha_hash,
+            "papel": UserRole.ADMIN,
+        }
+        for record, senha_hash in zip(records, hashes)
+    ]
+    
+    columns = (UsuarioDb.id, UsuarioDb.email, UsuarioDb.criado_em)
+    with atomic(db):
+        if db.get_bind().dialect.insert_executemany_returning:
+            created = db.execute(insert(UsuarioDb).returning(*columns), rows).all()
+        else:
+            db.execute(insert(UsuarioDb), rows)
+            created = db.execute(
+                select(*columns)
+                .where(UsuarioDb.email.in_([row["email"] for row in rows]))
+                .order_by(UsuarioDb.id)
+            ).all()
+    return created
+
+
 def manage_admin_users():
     """
     Interface principal para gerenciar usuários administradores.
     Permite criar, listar, editar e excluir administradores.
     """
+    from app.core.db_context import SessionLocal
+    
     print_header()
     
     # Criar sessão do banco
@@ -171,14 +351,7 @@ def manage_admin_users():
     
     try:
         while True:
-            print("\n🚀" + "=" * 40 + "🚀")
-            print("      GERENCIAMENTO DE ADMINISTRADORES")
-            print("🚀" + "=" * 40 + "🚀")
-            print("   1️⃣  Criar novo administrador")
-            print("   2️⃣  Listar administradores")
-            print("   3️⃣  Editar administrador")
-            print("   4️⃣  Excluir administrador")
-            print("   5️⃣  Sair")
+            print(MENU_PRINCIPAL)
             
             choice = input("\n🎯 Escolha uma opção (1-5): ").strip()
             
@@ -206,10 +379,17 @@ def create_admin_user(db: Session):
     """
     Cria um usuário administrador.
     """
+    from sqlalchemy import exists, select
+    from app.core.security.password import PasswordManager
+    from app.models.db import UsuarioDb
+    from app.models.enums import UserRole
+    
     clear_screen()
-    print("🚀" + "=" * 40 + "🚀")
-    print("       CRIAÇÃO DE ADMINISTRADOR")
-    print("🚀" + "=" * 40 + "🚀")
+    print_lines((
+        LINHA_TITULO,
+        "       CRIAÇÃO DE ADMINISTRADOR",
+        LINHA_TITULO,
+    ))
     
     try:
         # Mostrar admins existentes
@@ -227,8 +407,7 @@ def create_admin_user(db: Session):
         )
         
         # Verificar se email já existe
-        existing_user = db.query(UsuarioDb).filter(UsuarioDb.email == email).first()
-        if existing_user:
+        if db.scalar(select(exists().where(UsuarioDb.email == email))):
             print(f"\n❌ ERRO: Já existe um usuário com o email '{email}'!")
             print("💡 Use um email diferente ou delete o usuário existente.")
             input("\nPressione ENTER para continuar...")
@@ -270,27 +449,28 @@ def create_admin_user(db: Session):
             papel=UserRole.ADMIN
         )
         
-        db.add(admin_user)
-        db.commit()
+        with atomic(db):
+            db.add(admin_user)
         db.refresh(admin_user)
         
         # Sucesso!
-        print("\n🎉" + "=" * 45 + "🎉")
-        print("        ADMINISTRADOR CRIADO COM SUCESSO!")
-        print("🎉" + "=" * 45 + "🎉")
-        print(f"   🆔 ID: {admin_user.id}")
-        print(f"   👤 Nome: {admin_user.nome} {admin_user.sobrenome}")
-        print(f"   📧 Email: {admin_user.email}")
-        print(f"   👑 Papel: {admin_user.papel.value}")
-        print(f"   📅 Criado em: {admin_user.criado_em}")
-        
-        print("\n🔑" + "=" * 45 + "🔑")
-        print("           CREDENCIAIS DE ACESSO")
-        print("🔑" + "=" * 45 + "🔑")
-        print(f"   🌐 URL: http://localhost:8000/admin")
-        print(f"   📧 Email: {email}")
-        print(f"   🔒 Senha: {senha}")
-        print("🔑" + "=" * 45 + "🔑")
+        print_lines((
+            "\n" + LINHA_SUCESSO,
+            "        ADMINISTRADOR CRIADO COM SUCESSO!",
+            LINHA_SUCESSO,
+            f"   🆔 ID: {admin_user.id}",
+            f"   👤 Nome: {admin_user.nome} {admin_user.sobrenome}",
+            f"   📧 Email: {admin_user.email}",
+            f"   👑 Papel: {admin_user.papel.value}",
+            f"   📅 Criado em: {admin_user.criado_em}",
+            "\n" + LINHA_CREDENCIAIS,
+            "           CREDENCIAIS DE ACESSO",
+            LINHA_CREDENCIAIS,
+            f"   🌐 URL: http://localhost:8000/admin",
+            f"   📧 Email: {email}",
+            f"   🔒 Senha: {senha}",
+            LINHA_CREDENCIAIS,
+        ))
         
         # Opção de salvar credenciais
         print("\n💾 Deseja salvar as credenciais em arquivo?")
@@ -303,7 +483,6 @@ def create_admin_user(db: Session):
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"\n💥 ERRO: Falha ao criar administrador!")
         print(f"📋 Detalhes: {e}")
         input("\nPressione ENTER para continuar...")
@@ -315,36 +494,39 @@ def list_admin_users(db: Session):
     Lista todos os administradores existentes com detalhes.
     """
     clear_screen()
-    print("🚀" + "=" * 40 + "🚀")
-    print("       LISTAGEM DE ADMINISTRADORES")
-    print("🚀" + "=" * 40 + "🚀")
+    print_lines((
+        LINHA_TITULO,
+        "       LISTAGEM DE ADMINISTRADORES",
+        LINHA_TITULO,
+    ))
     
     try:
-        admins = db.query(UsuarioDb).filter(UsuarioDb.papel == UserRole.ADMIN).all()
+        admins = get_admin_rows(db).all()
         
         if not admins:
             print("\n⚠️  Nenhum administrador encontrado no sistema!")
             input("\nPressione ENTER para continuar...")
             return
         
-        print(f"\n🔍 Encontrados {len(admins)} administrador(es):\n")
-        print("-" * 70)
-        print(f"{'ID':<5} | {'Nome':<20} | {'Email':<25} | {'Criado em':<19}")
-        print("-" * 70)
+        linhas = ["", SEPARADOR_LONGO, CABECALHO_LISTAGEM, SEPARADOR_LONGO]
         
         for admin in admins:
             nome_completo = f"{admin.nome} {admin.sobrenome}"
             criado_em = admin.criado_em.strftime('%d/%m/%Y %H:%M') if admin.criado_em else 'N/A'
-            print(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25} | {criado_em:<19}")
+            linhas.append(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25} | {criado_em:<19}")
         
-        print("-" * 70)
+        linhas.append(SEPARADOR_LONGO)
+        linhas.append(f"🔍 Encontrados {len(admins)} administrador(es)")
+        print_lines(linhas)
         
         # Opção para ver detalhes
         print("\n🔍 Deseja ver detalhes de algum administrador?")
         admin_id = input("🆔 Digite o ID (ou ENTER para voltar): ").strip()
         
         if admin_id:
-            view_admin_details(db, admin_id)
+            admin_id = parse_admin_id(admin_id)
+            if admin_id is not None:
+                view_admin_details(db, admin_id)
         
         input("\nPressione ENTER para continuar...")
         
@@ -353,31 +535,29 @@ def list_admin_users(db: Session):
         input("\nPressione ENTER para continuar...")
 
 
-def view_admin_details(db: Session, admin_id):
+def view_admin_details(db: Session, admin_id: int):
     """
     Exibe detalhes de um administrador específico.
     """
     try:
-        admin = db.query(UsuarioDb).filter(
-            UsuarioDb.id == admin_id,
-            UsuarioDb.papel == UserRole.ADMIN
-        ).first()
+        admin = get_admin_by_id(db, admin_id)
         
         if not admin:
             print(f"\n❌ ERRO: Administrador com ID {admin_id} não encontrado!")
             return
         
         clear_screen()
-        print("🚀" + "=" * 40 + "🚀")
-        print("       DETALHES DO ADMINISTRADOR")
-        print("🚀" + "=" * 40 + "🚀")
-        
-        print(f"\n🆔 ID: {admin.id}")
-        print(f"👤 Nome: {admin.nome} {admin.sobrenome}")
-        print(f"📧 Email: {admin.email}")
-        print(f"👑 Papel: {admin.papel.value}")
-        print(f"📅 Criado em: {admin.criado_em}")
-        print(f"📅 Atualizado em: {admin.atualizado_em}")
+        print_lines((
+            LINHA_TITULO,
+            "       DETALHES DO ADMINISTRADOR",
+            LINHA_TITULO,
+            f"\n🆔 ID: {admin.id}",
+            f"👤 Nome: {admin.nome} {admin.sobrenome}",
+            f"📧 Email: {admin.email}",
+            f"👑 Papel: {admin.papel.value}",
+            f"📅 Criado em: {admin.criado_em}",
+            f"📅 Atualizado em: {admin.atualizado_em}",
+        ))
         
     except Exception as e:
         print(f"\n💥 ERRO: {e}")
@@ -387,32 +567,36 @@ def edit_admin_user(db: Session):
     """
     Edita informações de um administrador existente.
     """
+    from sqlalchemy import exists, func, select
+    from app.core.security.password import PasswordManager
+    from app.models.db import UsuarioDb
+    
     clear_screen()
-    print("🚀" + "=" * 40 + "🚀")
-    print("       EDIÇÃO DE ADMINISTRADOR")
-    print("🚀" + "=" * 40 + "🚀")
+    print_lines((
+        LINHA_TITULO,
+        "       EDIÇÃO DE ADMINISTRADOR",
+        LINHA_TITULO,
+    ))
     
     try:
         # Variável para armazenar senha, se alterada
         senha_alterada = None
         # Listar administradores para seleção
-        admins = db.query(UsuarioDb).filter(UsuarioDb.papel == UserRole.ADMIN).all()
+        admins = get_admin_rows(db).all()
         
         if not admins:
             print("\n⚠️  Nenhum administrador encontrado para editar!")
             input("\nPressione ENTER para continuar...")
             return
         
-        print("\n🔍 Selecione um administrador para editar:\n")
-        print("-" * 60)
-        print(f"{'ID':<5} | {'Nome':<20} | {'Email':<25}")
-        print("-" * 60)
+        linhas = ["\n🔍 Selecione um administrador para editar:\n", SEPARADOR_MEDIO, CABECALHO_SELECAO, SEPARADOR_MEDIO]
         
         for admin in admins:
             nome_completo = f"{admin.nome} {admin.sobrenome}"
-            print(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25}")
+            linhas.append(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25}")
         
-        print("-" * 60)
+        linhas.append(SEPARADOR_MEDIO)
+        print_lines(linhas)
         
         admin_id = input("\n🆔 Digite o ID do administrador (ou ENTER para cancelar): ").strip()
         
@@ -420,11 +604,13 @@ def edit_admin_user(db: Session):
             print("❌ Operação cancelada!")
             return
         
+        admin_id = parse_admin_id(admin_id)
+        if admin_id is None:
+            input("\nPressione ENTER para continuar...")
+            return
+        
         # Buscar o administrador
-        admin = db.query(UsuarioDb).filter(
-            UsuarioDb.id == admin_id,
-            UsuarioDb.papel == UserRole.ADMIN
-        ).first()
+        admin = get_admin_by_id(db, admin_id)
         
         if not admin:
             print(f"\n❌ ERRO: Administrador com ID {admin_id} não encontrado!")
@@ -433,19 +619,19 @@ def edit_admin_user(db: Session):
         
         # Mostrar detalhes atuais e opções de edição
         clear_screen()
-        print("🚀" + "=" * 40 + "🚀")
-        print("       EDIÇÃO DE ADMINISTRADOR")
-        print("🚀" + "=" * 40 + "🚀")
-        
-        print(f"\n👤 Editando: {admin.nome} {admin.sobrenome} (ID: {admin.id})")
-        print(f"📧 Email atual: {admin.email}")
-        
-        print("\n📝 Selecione o que deseja editar:")
-        print("   1️⃣  Nome")
-        print("   2️⃣  Sobrenome")
-        print("   3️⃣  Email")
-        print("   4️⃣  Senha")
-        print("   5️⃣  Voltar")
+        print_lines((
+            LINHA_TITULO,
+            "       EDIÇÃO DE ADMINISTRADOR",
+            LINHA_TITULO,
+            f"\n👤 Editando: {admin.nome} {admin.sobrenome} (ID: {admin.id})",
+            f"📧 Email atual: {admin.email}",
+            "\n📝 Selecione o que deseja editar:",
+            "   1️⃣  Nome",
+            "   2️⃣  Sobrenome",
+            "   3️⃣  Email",
+            "   4️⃣  Senha",
+            "   5️⃣  Voltar",
+        ))
         
         option = input("\n🎯 Escolha uma opção (1-5): ").strip()
         
@@ -467,12 +653,12 @@ def edit_admin_user(db: Session):
             )
             
             # Verificar se o novo email já está em uso
-            existing = db.query(UsuarioDb).filter(
+            email_em_uso = db.scalar(select(exists().where(
                 UsuarioDb.email == email,
                 UsuarioDb.id != admin.id
-            ).first()
+            )))
             
-            if existing:
+            if email_em_uso:
                 print(f"\n❌ ERRO: O email '{email}' já está em uso!")
                 input("\nPressione ENTER para continuar...")
                 return
@@ -503,13 +689,16 @@ def edit_admin_user(db: Session):
         confirma = input("✅ Digite 'CONFIRMAR' para prosseguir (ou ENTER para cancelar): ").strip()
         
         if confirma.upper() != "CONFIRMAR":
+            # Descartar a alteração pendente para que não seja gravada por outra ação
+            db.rollback()
             print("❌ Operação cancelada!")
             input("\nPressione ENTER para continuar...")
             return
         
         # Salvar alterações
-        admin.atualizado_em = datetime.datetime.utcnow()
-        db.commit()
+        with atomic(db):
+            # Carimbo de data/hora gerado pelo próprio banco, no mesmo UPDATE
+            admin.atualizado_em = func.now()
         
         print(f"\n✅ Administrador atualizado com sucesso!")
         print(f"🔄 Campo '{campo}' foi alterado.")
@@ -531,38 +720,51 @@ def delete_admin_user(db: Session):
     """
     Exclui um administrador do sistema.
     """
+    from sqlalchemy import func, select
+    from app.models.db import UsuarioDb
+    from app.models.enums import UserRole
+    
     clear_screen()
-    print("🚀" + "=" * 40 + "🚀")
-    print("       EXCLUSÃO DE ADMINISTRADOR")
-    print("🚀" + "=" * 40 + "🚀")
+    print_lines((
+        LINHA_TITULO,
+        "       EXCLUSÃO DE ADMINISTRADOR",
+        LINHA_TITULO,
+    ))
     
     try:
-        # Listar administradores para seleção
-        admins = db.query(UsuarioDb).filter(UsuarioDb.papel == UserRole.ADMIN).all()
+        # Contar no máximo 2 administradores (basta saber se há 0, 1 ou mais)
+        num_admins = db.scalar(
+            select(func.count()).select_from(
+                select(UsuarioDb.id)
+                .where(UsuarioDb.papel == UserRole.ADMIN)
+                .limit(2)
+                .subquery()
+            )
+        )
         
-        if not admins:
+        if not num_admins:
             print("\n⚠️  Nenhum administrador encontrado para excluir!")
             input("\nPressione ENTER para continuar...")
             return
         
         # Verificar se temos pelo menos 2 administradores
-        if len(admins) < 2:
-            print("\n⚠️  ATENÇÃO: Existe apenas um administrador no sistema!")
-            print("❌ Não é possível excluir o único administrador.")
-            print("💡 Crie outro administrador antes de excluir este.")
+        if num_admins < 2:
+            print_lines((
+                "\n⚠️  ATENÇÃO: Existe apenas um administrador no sistema!",
+                "❌ Não é possível excluir o único administrador.",
+                "💡 Crie outro administrador antes de excluir este.",
+            ))
             input("\nPressione ENTER para continuar...")
             return
         
-        print("\n🔍 Selecione um administrador para excluir:\n")
-        print("-" * 60)
-        print(f"{'ID':<5} | {'Nome':<20} | {'Email':<25}")
-        print("-" * 60)
+        linhas = ["\n🔍 Selecione um administrador para excluir:\n", SEPARADOR_MEDIO, CABECALHO_SELECAO, SEPARADOR_MEDIO]
         
-        for admin in admins:
+        for admin in get_admin_rows(db):
             nome_completo = f"{admin.nome} {admin.sobrenome}"
-            print(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25}")
+            linhas.append(f"{admin.id:<5} | {nome_completo:<20} | {admin.email:<25}")
         
-        print("-" * 60)
+        linhas.append(SEPARADOR_MEDIO)
+        print_lines(linhas)
         
         admin_id = input("\n🆔 Digite o ID do administrador a excluir (ou ENTER para cancelar): ").strip()
         
@@ -570,11 +772,13 @@ def delete_admin_user(db: Session):
             print("❌ Operação cancelada!")
             return
         
+        admin_id = parse_admin_id(admin_id)
+        if admin_id is None:
+            input("\nPressione ENTER para continuar...")
+            return
+        
         # Buscar o administrador
-        admin = db.query(UsuarioDb).filter(
-            UsuarioDb.id == admin_id,
-            UsuarioDb.papel == UserRole.ADMIN
-        ).first()
+        admin = get_admin_by_id(db, admin_id)
         
         if not admin:
             print(f"\n❌ ERRO: Administrador com ID {admin_id} não encontrado!")
@@ -582,11 +786,13 @@ def delete_admin_user(db: Session):
             return
         
         # Confirmar exclusão
-        print("\n⚠️  ATENÇÃO: Esta operação não pode ser desfeita!")
-        print(f"🗑️  Você está prestes a excluir o administrador:")
-        print(f"   👤 {admin.nome} {admin.sobrenome}")
-        print(f"   📧 {admin.email}")
-        print(f"   🆔 ID: {admin.id}")
+        print_lines((
+            "\n⚠️  ATENÇÃO: Esta operação não pode ser desfeita!",
+            f"🗑️  Você está prestes a excluir o administrador:",
+            f"   👤 {admin.nome} {admin.sobrenome}",
+            f"   📧 {admin.email}",
+            f"   🆔 ID: {admin.id}",
+        ))
         
         confirm = input("\n⚠️  Digite o email do administrador para confirmar a exclusão: ").strip()
         
@@ -598,8 +804,8 @@ def delete_admin_user(db: Session):
         print("\n🔄 Excluindo administrador...")
         
         # Excluir administrador
-        db.delete(admin)
-        db.commit()
+        with atomic(db):
+            db.delete(admin)
         
         print("\n✅ Administrador excluído com sucesso!")
         input("\nPressione ENTER para continuar...")
@@ -626,16 +832,20 @@ def main():
         success = manage_admin_users()
         
         if success:
-            print("\n" + "🎊" * 15)
-            print("🎉 PROCESSO CONCLUÍDO COM SUCESSO! 🎉")
-            print("🎊" * 15)
+            print_lines((
+                "\n" + LINHA_CELEBRACAO,
+                "🎉 PROCESSO CONCLUÍDO COM SUCESSO! 🎉",
+                LINHA_CELEBRACAO,
+            ))
             
             # Menu pós-criação
-            print("\n🎯 Próximos passos:")
-            print("   1️⃣  Iniciar o servidor SalasTech")
-            print("   2️⃣  Acessar o painel administrativo")
-            print("   3️⃣  Voltar ao gerenciamento de administradores")
-            print("   4️⃣  Sair")
+            print_lines((
+                "\n🎯 Próximos passos:",
+                "   1️⃣  Iniciar o servidor SalasTech",
+                "   2️⃣  Acessar o painel administrativo",
+                "   3️⃣  Voltar ao gerenciamento de administradores",
+                "   4️⃣  Sair",
+            ))
             
             while True:
                 choice = input("\n🚀 Escolha uma opção (1/2/3/4): ").strip()
@@ -658,9 +868,11 @@ def main():
             
             sys.exit(0)
         else:
-            print("\n" + "💥" * 15)
-            print("💔 PROCESSO FALHOU!")
-            print("💥" * 15)
+            print_lines((
+                "\n" + LINHA_ERRO,
+                "💔 PROCESSO FALHOU!",
+                LINHA_ERRO,
+            ))
             
             retry = input("\n🔄 Deseja tentar novamente? (s/N): ").strip().lower()
             if retry in ['s', 'sim', 'y', 'yes']:
@@ -673,12 +885,14 @@ def main():
         print("👋 Até logo!")
         sys.exit(0)
     except Exception as e:
-        print(f"\n💥 ERRO INESPERADO: {e}")
-        print("\n🔧 Possíveis soluções:")
-        print("   • Verifique a conexão com o banco de dados")
-        print("   • Confirme se todas as dependências estão instaladas")
-        print("   • Execute 'pip install -r requirements.txt'")
-        print("   • Verifique se as migrações foram aplicadas")
+        print_lines((
+            f"\n💥 ERRO INESPERADO: {e}",
+            "\n🔧 Possíveis soluções:",
+            "   • Verifique a conexão com o banco de dados",
+            "   • Confirme se todas as dependências estão instaladas",
+            "   • Execute 'pip install -r requirements.txt'",
+            "   • Verifique se as migrações foram aplicadas",
+        ))
         sys.exit(1)
 
 
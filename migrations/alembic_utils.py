@@ -7,6 +7,19 @@ import os
 import sys
 from pathlib import Path
 
+# A disponibilidade do Alembic é verificada uma única vez, na importação do módulo
+try:
+    from alembic.config import Config
+    ALEMBIC_AVAILABLE = True
+except ImportError:
+    Config = None
+    ALEMBIC_AVAILABLE = False
+
+# Caminhos do ambiente de migrações (fixos, calculados uma única vez)
+MIGRATIONS_DIR = Path(__file__).parent
+ALEMBIC_INI = MIGRATIONS_DIR / "alembic.ini"
+VERSIONS_DIR = MIGRATIONS_DIR / "versions"
+
 
 def check_alembic_environment():
     """
@@ -15,32 +28,27 @@ def check_alembic_environment():
     Retorna:
         bool: True se o ambiente está ok, False caso contrário
     """
+    if not ALEMBIC_AVAILABLE:
+        print("❌ Alembic não está instalado! Execute: pip install alembic")
+        return False
+    
     try:
-        from alembic import command
-        from alembic.config import Config
-        
         # Verifica se o arquivo alembic.ini existe
-        migrations_dir = Path(__file__).parent
-        alembic_ini = migrations_dir / "alembic.ini"
-        if not alembic_ini.exists():
+        if not ALEMBIC_INI.exists():
             print("❌ Arquivo alembic.ini não encontrado!")
             return False
         
         # Verifica se o diretório versions existe
-        versions_dir = migrations_dir / "versions"
-        if not versions_dir.exists():
+        if not VERSIONS_DIR.exists():
             print("❌ Diretório versions não encontrado!")
             return False
         
         # Tenta carregar a configuração
-        alembic_cfg = Config(str(alembic_ini))
+        alembic_cfg = Config(str(ALEMBIC_INI))
         
         # Tudo ok
         return True
     
-    except ImportError:
-        print("❌ Alembic não está instalado! Execute: pip install alembic")
-        return False
     except Exception as e:
         print(f"❌ Erro ao verificar ambiente Alembic: {e}")
         return False
@@ -53,16 +61,13 @@ def setup_alembic_environment():
     Retorna:
         bool: True se a configuração foi bem sucedida, False caso contrário
     """
-    migrations_dir = Path(__file__).parent
-    
     # Verifica se o diretório versions existe, se não, cria
-    versions_dir = migrations_dir / "versions"
-    if not versions_dir.exists():
+    if not VERSIONS_DIR.exists():
         print("📁 Criando diretório versions...")
-        versions_dir.mkdir(exist_ok=True)
+        VERSIONS_DIR.mkdir(exist_ok=True)
     
     # Verifica se o arquivo __init__.py existe em versions
-    init_file = versions_dir / "__init__.py"
+    init_file = VERSIONS_DIR / "__init__.py"
     if not init_file.exists():
         print("📄 Criando arquivo __init__.py em versions...")
         init_file.touch()
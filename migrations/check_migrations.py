@@ -10,19 +10,26 @@ Saída:
   Relatório de integridade das migrações
 """
 
+import hashlib
 import sys
-import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from sqlalchemy import create_engine, MetaData, inspect
-from alembic.migration import MigrationContext
-from alembic.operations import Operations
-from alembic.autogenerate import compare_metadata
-from alembic.config import Config
-from alembic import command
+from typing import Optional
+
+# SQLAlchemy e Alembic são importados nas funções que os utilizam, para que a
+# importação deste módulo não pague o custo de carregá-los
 
 # Adicionar diretório do projeto ao path para importações
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Arquivo de configuração do Alembic
+ALEMBIC_INI = Path(__file__).parent / "alembic.ini"
 
 try:
     from app.core.config import Config as AppConfig
@@ -34,6 +41,7 @@ except ImportError:
     AppConfig = None
 
 
+@lru_cache(maxsize=1)
 def get_db_url():
     """Obtém a URL do banco de dados"""
     try:
@@ -47,16 +55,91 @@ def get_db_url():
     return "sqlite:///db.sqlite"
 
 
+# Engine e Inspector compartilhados entre as verificações, criados sob demanda.
+# O Inspector guarda em cache os resultados da reflexão, evitando repetir as
+# consultas ao catálogo do banco a cada verificação.
+_engine = None
+_inspector = None
+
+# As verificações rodam em paralelo: a criação dos objetos compartilhados é
+# protegida por um lock, e as operações do Alembic (que leem o alembic.ini e
+# o ambiente de migrações) são executadas uma de cada vez
+_init_lock = threading.RLock()
+_alembic_lock = threading.Lock()
+
+# Limite de diferenças contadas no relatório de migrações pendentes
+MAX_REPORTED_DIFFS = 50
+
+
+def get_engine():
+    """Retorna o engine compartilhado, criando-o na primeira chamada"""
+    from sqlalchemy import create_engine, pool
+    
+    global _engine
+    with _init_lock:
+        if _engine is None:
+            # Mesmo pool usado pelo env.py: cada verificação abre e fecha sua própria conexão
+            _engine = create_engine(get_db_url(), poolclass=pool.NullPool)
+        return _engine
+
+
+def get_inspector():
+    """Retorna o Inspector compartilhado, criando-o na primeira chamada"""
+    from sqlalchemy import inspect
+    
+    global _inspector
+    with _init_lock:
+        if _inspector is None:
+            _inspector = inspect(get_engine())
+        return _inspector
+
+
+def dispose_engine():
+    """Libera as conexões do engine compartilhado"""
+    global _engine, _inspector, _probe_result
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _inspector = None
+    _probe_result = None
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Estado da tabela de controle do Alembic"""
+    has_table: bool
+    revision: Optional[str]
+
+
+# Resultado da sondagem, calculado uma vez por execução de main()
+_probe_result = None
+
+
+def _probe_alembic_version():
+    """
+    Consulta a existência da tabela alembic_version e a revisão atual
+    no banco configurado (get_db_url), pelo engine compartilhado.
+    """
+    from sqlalchemy import text
+    
+    global _probe_result
+    with _init_lock:
+        if _probe_result is None:
+            has_table = get_inspector().has_table("alembic_version")
+            
+            revision = None
+            if has_table:
+                with get_engine().connect() as connection:
+                    revision = connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+            
+            _probe_result = ProbeResult(has_table=has_table, revision=revision)
+        return _probe_result
+
+
 def check_alembic_table():
     """Verifica se a tabela de versões do alembic existe"""
     try:
-        conn = sqlite3.connect("db.sqlite")
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='alembic_version'")
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result and result[0] == 'alembic_version':
+        if _probe_alembic_version().has_table:
             return True, "A tabela de controle alembic_version existe."
         else:
             return False, "❌ Tabela alembic_version não encontrada. O Alembic não está inicializado."
@@ -67,14 +150,9 @@ def check_alembic_table():
 def get_current_revision():
     """Obtém a revisão atual do Alembic"""
     try:
-        conn = sqlite3.connect("db.sqlite")
-        cursor = conn.cursor()
-        cursor.execute("SELECT version_num FROM alembic_version")
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return True, f"Revisão atual: {result[0]}"
+        revision = _probe_alembic_version().revision
+        if revision:
+            return True, f"Revisão atual: {revision}"
         else:
             return False, "❌ Nenhuma revisão encontrada na tabela alembic_version."
     except Exception as e:
@@ -87,14 +165,11 @@ def check_table_existence():
         return None, "⚠️ Não foi possível verificar tabelas (modelos não importados)"
     
     try:
-        engine = create_engine(get_db_url())
-        inspector = inspect(engine)
-        db_tables = inspector.get_table_names()
-        
-        model_tables = [table.name for table in Base.metadata.tables.values()]
+        db_tables = set(get_inspector().get_table_names())
+        model_tables = set(Base.metadata.tables)
         
-        missing_tables = [t for t in model_tables if t not in db_tables]
-        extra_tables = [t for t in db_tables if t not in model_tables and t != 'alembic_version']
+        missing_tables = sorted(model_tables - db_tables)
+        extra_tables = sorted(db_tables - model_tables - {'alembic_version'})
         
         status = True
         messages = []
@@ -114,68 +189,137 @@ def check_table_existence():
         return False, f"❌ Erro ao verificar tabelas: {e}"
 
 
+def _ddl_fingerprint(statements):
+    """Hash de um conjunto de comandos DDL (nome, sql), independente de espaçamento e ordem"""
+    fingerprint = hashlib.blake2b()
+    for name, sql in sorted(statements):
+        fingerprint.update(name.encode())
+        fingerprint.update(" ".join(sql.split()).encode())
+    return fingerprint.hexdigest()
+
+
+def _schema_matches_models(connection):
+    """
+    Verificação rápida para SQLite: compara o DDL gerado a partir dos modelos com o DDL
+    armazenado no sqlite_master. Só retorna True quando os esquemas são textualmente
+    idênticos; em qualquer outro caso a comparação completa do Alembic é necessária.
+    """
+    from sqlalchemy import text
+    from sqlalchemy.schema import CreateIndex, CreateTable
+    
+    dialect = connection.dialect
+    if dialect.name != "sqlite":
+        return False
+    
+    model_ddl = []
+    for table in Base.metadata.tables.values():
+        model_ddl.append((table.name, str(CreateTable(table).compile(dialect=dialect))))
+        model_ddl.extend(
+            (index.name, str(CreateIndex(index).compile(dialect=dialect)))
+            for index in table.indexes
+        )
+    
+    db_ddl = connection.execute(text(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type IN ('table', 'index') AND sql IS NOT NULL AND name != 'alembic_version'"
+    )).all()
+    
+    return _ddl_fingerprint(model_ddl) == _ddl_fingerprint(db_ddl)
+
+
+def _include_object(object, name, type_, reflected, compare_to):
+    """Mesmo filtro do env.py: ignora tabelas do banco que não pertencem aos modelos"""
+    if type_ == "table" and reflected and name not in Base.metadata.tables:
+        return False
+    return True
+
+
 def check_pending_migrations():
     """Verifica se há migrações pendentes"""
+    from alembic.autogenerate import produce_migrations
+    from alembic.migration import MigrationContext
+    
     try:
-        engine = create_engine(get_db_url())
-        connection = engine.connect()
-        
-        context = MigrationContext.configure(connection)
-        alembic_cfg = Config(str(Path(__file__).parent / "alembic.ini"))
+        if not Base:
+            return None, "⚠️ Não foi possível verificar diferenças (modelos não importados)"
         
-        with engine.begin() as conn:
-            if Base:
-                diff = compare_metadata(context, Base.metadata)
-                if diff:
-                    return False, f"❌ Há diferenças entre o banco e os modelos. {len(diff)} alterações pendentes."
-                else:
-                    return True, "✅ Não há diferenças entre o banco e os modelos."
+        # Uma única conexão para a verificação rápida e para o diff do Alembic
+        with get_engine().connect() as connection:
+            # Caminho rápido: esquema idêntico ao dos modelos dispensa o diff do Alembic
+            if _schema_matches_models(connection):
+                return True, "✅ Não há diferenças entre o banco e os modelos."
+            
+            with _alembic_lock:
+                # Mesmas opções de comparação configuradas no env.py
+                context = MigrationContext.configure(
+                    connection,
+                    opts={
+                        "compare_type": True,
+                        "compare_server_default": True,
+                        "include_object": _include_object,
+                    },
+                )
+                # As diferenças são percorridas sob demanda, sem montar a lista completa
+                diffs = produce_migrations(context, Base.metadata).upgrade_ops.as_diffs()
+                total = sum(1 for _ in islice(diffs, MAX_REPORTED_DIFFS + 1))
+            
+            if total:
+                quantidade = f"{MAX_REPORTED_DIFFS}+" if total > MAX_REPORTED_DIFFS else str(total)
+                return False, f"❌ Há diferenças entre o banco e os modelos. {quantidade} alterações pendentes."
             else:
-                return None, "⚠️ Não foi possível verificar diferenças (modelos não importados)"
+                return True, "✅ Não há diferenças entre o banco e os modelos."
     except Exception as e:
         return False, f"❌ Erro ao verificar migrações pendentes: {e}"
 
 
+@lru_cache(maxsize=1)
+def _get_alembic_cfg():
+    """Retorna a configuração do Alembic, lida uma única vez por processo"""
+    from alembic.config import Config
+    
+    return Config(str(ALEMBIC_INI))
+
+
 def run_alembic_check():
     """Executa verificações do Alembic"""
+    from alembic import command
+    
     try:
-        alembic_cfg = Config(str(Path(__file__).parent / "alembic.ini"))
-        command.check(alembic_cfg)
+        with _alembic_lock:
+            command.check(_get_alembic_cfg())
         return True, "✅ Verificação do Alembic não encontrou problemas."
     except Exception as e:
         return False, f"❌ Verificação do Alembic encontrou problemas: {e}"
 
 
+# Verificações executadas por main(), na ordem em que são exibidas
+CHECKS = (
+    ("Tabela de controle Alembic", check_alembic_table),
+    ("Revisão Alembic", get_current_revision),
+    ("Verificação de tabelas", check_table_existence),
+    ("Migrações pendentes", check_pending_migrations),
+    ("Verificação Alembic", run_alembic_check),
+)
+
+
 def main():
     """Função principal"""
     print("🔍 Verificação de Integridade das Migrações")
     print("===========================================")
     
-    # Verifica tabela do Alembic
-    status, message = check_alembic_table()
-    print(f"\n📋 Tabela de controle Alembic: {'✅' if status else '❌'}")
-    print(f"  {message}")
-    
-    # Verifica revisão atual
-    status, message = get_current_revision()
-    print(f"\n📋 Revisão Alembic: {'✅' if status else '❌'}")
-    print(f"  {message}")
-    
-    # Verifica existência de tabelas
-    status, message = check_table_existence()
-    print(f"\n📋 Verificação de tabelas: {'✅' if status else '⚠️' if status is None else '❌'}")
-    for line in message.split('\n'):
-        print(f"  {line}")
-    
-    # Verifica migrações pendentes
-    status, message = check_pending_migrations()
-    print(f"\n📋 Migrações pendentes: {'✅' if status else '⚠️' if status is None else '❌'}")
-    print(f"  {message}")
-    
-    # Executa verificação do Alembic
-    status, message = run_alembic_check()
-    print(f"\n📋 Verificação Alembic: {'✅' if status else '❌'}")
-    print(f"  {message}")
+    try:
+        # As verificações aguardam principalmente o banco, então rodam em paralelo;
+        # os resultados são exibidos na ordem fixa de CHECKS
+        with ThreadPoolExecutor(max_workers=len(CHECKS)) as executor:
+            futures = [(label, executor.submit(check)) for label, check in CHECKS]
+            
+            for label, future in futures:
+                status, message = future.result()
+                print(f"\n📋 {label}: {'✅' if status else '⚠️' if status is None else '❌'}")
+                for line in message.split('\n'):
+                    print(f"  {line}")
+    finally:
+        dispose_engine()
     
     print("\n===========================================")
     print("🔍 Verificação concluída!")
@@ -19,8 +19,10 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from alembic import context
 
 # Adicionar o diretório do projeto ao path para importar os modelos
+# (este arquivo é executado a cada comando do Alembic; evita entradas duplicadas)
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 # Importar configuração e modelos
 from app.core.config import Config
@@ -39,6 +41,9 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# Nomes das tabelas dos modelos, consultados por include_object a cada objeto refletido
+model_table_names = frozenset(target_metadata.tables)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -123,7 +128,7 @@ def include_object(object, name, type_, reflected, compare_to):
     Útil para filtrar tabelas, índices ou constraints específicos.
     """
     # Se for uma tabela que não está no modelo, não incluí-la na migração
-    if type_ == "table" and reflected and name not in Base.metadata.tables:
+    if type_ == "table" and reflected and name not in model_table_names:
         return False
     
     # Incluir todos os outros objetos
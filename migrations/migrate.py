@@ -4,15 +4,80 @@ Script wrapper simplificado para uso cotidiano
 Comandos mais comuns do Migration Manager
 """
 
+import hashlib
+import json
+import os
 import sys
-import subprocess
+from importlib import metadata
 from pathlib import Path
 
+# Diretório do projeto no path, para importar os módulos de migrations
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent
+
+# Cache em disco de um "check" bem-sucedido, válido enquanto o alembic.ini, os arquivos
+# de versions e a versão instalada do Alembic não mudarem (falhas nunca são guardadas)
+CHECK_CACHE_FILE = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "salastech" / "migrate_check.json"
+
+# Comandos do migration manager que alteram as migrações ou o banco
+MUTATING_COMMANDS = {"upgrade", "downgrade", "revision", "reset"}
+
+def check_cache_key():
+    """
+    Chave do cache: diretório de migrações (o arquivo de cache é compartilhado entre
+    cópias do projeto), versão do Alembic e mtimes do alembic.ini e dos arquivos de
+    versions. Retorna None se algum deles não existir.
+    """
+    try:
+        alembic_version = metadata.version("alembic")
+        ini_mtime = (MIGRATIONS_DIR / "alembic.ini").stat().st_mtime_ns
+        versions = sorted((p.name, p.stat().st_mtime_ns) for p in (MIGRATIONS_DIR / "versions").glob("*.py"))
+    except (OSError, metadata.PackageNotFoundError):
+        return None
+    fingerprint = hashlib.blake2b(str((str(MIGRATIONS_DIR), alembic_version, ini_mtime, versions)).encode())
+    return fingerprint.hexdigest()
+
+def read_check_cache(key):
+    """Retorna True se há um check bem-sucedido em cache para a chave, ou None"""
+    try:
+        cached = json.loads(CHECK_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return True if cached.get("key") == key else None
+
+def write_check_cache(key):
+    """Grava um check bem-sucedido (falhas de escrita são ignoradas)"""
+    try:
+        CHECK_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CHECK_CACHE_FILE.write_text(json.dumps({"key": key}), encoding="utf-8")
+    except OSError:
+        pass
+
+def invalidate_check_cache():
+    """Remove o cache do comando check"""
+    try:
+        CHECK_CACHE_FILE.unlink()
+    except OSError:
+        pass
+
 def run_migration_manager(args):
-    """Executa o migration manager com os argumentos fornecidos"""
-    script_path = Path(__file__).parent / "migration_manager.py"
-    cmd = [sys.executable, str(script_path)] + args
-    return subprocess.run(cmd)
+    """Executa o migration manager com os argumentos fornecidos, no próprio processo"""
+    from migrations.migration_manager import Colors, main as migration_manager_main
+    
+    if args[0] in MUTATING_COMMANDS:
+        invalidate_check_cache()
+    
+    try:
+        migration_manager_main(args)
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}❌ Operação cancelada pelo usuário{Colors.NC}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"{Colors.RED}❌ Erro inesperado: {e}{Colors.NC}")
+        sys.exit(1)
 
 def main():
     if len(sys.argv) < 2:
@@ -58,10 +123,18 @@ def main():
         run_migration_manager(["reset"])
         
     elif command == "check":
-        # Importa e utiliza o módulo de verificação do ambiente Alembic
-        sys.path.insert(0, str(Path(__file__).parent.parent))
-        from migrations.alembic_utils import check_alembic_environment
-        if check_alembic_environment():
+        key = check_cache_key()
+        ok = read_check_cache(key) if key else None
+        if ok is None:
+            # Importa e utiliza o módulo de verificação do ambiente Alembic
+            from migrations.alembic_utils import check_alembic_environment
+            ok = check_alembic_environment()
+            # Apenas sucessos são guardados: uma falha é sempre verificada de novo,
+            # com a mensagem do motivo
+            if ok and key:
+                write_check_cache(key)
+        
+        if ok:
             print("✅ Ambiente Alembic está corretamente configurado!")
         else:
             print("❌ Ambiente Alembic não está corretamente configurado!")
@@ -69,8 +142,8 @@ def main():
             
     elif command == "setup":
         # Importa e utiliza o módulo de configuração do ambiente Alembic
-        sys.path.insert(0, str(Path(__file__).parent.parent))
         from migrations.alembic_utils import setup_alembic_environment
+        invalidate_check_cache()
         if setup_alembic_environment():
             print("✅ Ambiente Alembic configurado com sucesso!")
         else:
@@ -83,7 +156,6 @@ def main():
             revision = sys.argv[2]
         
         # Importa e executa o módulo de stamp
-        sys.path.insert(0, str(Path(__file__).parent.parent))
         from migrations.stamp import stamp_revision
         stamp_revision(revision)
     
@@ -8,12 +8,21 @@ Versão Python com recursos avançados
 import os
 import sys
 import shutil
-import subprocess
+import sqlite3
 import argparse
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, List
 
+try:
+    from migration_config import SECURITY_CONFIG
+except ImportError:
+    from migrations.migration_config import SECURITY_CONFIG
+
+# Padrão dos arquivos de backup gerados por backup_database
+BACKUP_PREFIX = "db_backup_"
+BACKUP_SUFFIX = ".sqlite"
+
 
 class Colors:
     """Cores para output no terminal"""
@@ -27,6 +36,21 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Sem cores quando a saída não é um terminal (pipes, logs de CI) ou quando NO_COLOR está definido
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR") is not None:
+    for _name in ('RED', 'GREEN', 'YELLOW', 'BLUE', 'PURPLE', 'CYAN', 'WHITE', 'NC'):
+        setattr(Colors, _name, '')
+
+# Header do aplicativo, montado uma única vez
+HEADER = "\n".join((
+    f"{Colors.BLUE}🛡️ ==============================================={Colors.NC}",
+    f"{Colors.BLUE}   SalasTech - Migration Manager v2.0 (Python){Colors.NC}",
+    f"{Colors.BLUE}   Gerenciador de Migrações de Banco de Dados{Colors.NC}",
+    f"{Colors.BLUE}🛡️ ==============================================={Colors.NC}",
+    "",
+))
+
+
 class MigrationManager:
     """Gerenciador de migrações para SalasTech"""
     
@@ -36,14 +60,11 @@ class MigrationManager:
         self.alembic_ini = self.migrations_dir / "alembic.ini"
         self.db_file = self.project_root / "db.sqlite"
         self.backup_dir = self.project_root / "backups"
+        self._alembic_cfg = None
         
     def show_header(self):
         """Mostra header do aplicativo"""
-        print(f"{Colors.BLUE}🛡️ ==============================================={Colors.NC}")
-        print(f"{Colors.BLUE}   SalasTech - Migration Manager v2.0 (Python){Colors.NC}")
-        print(f"{Colors.BLUE}   Gerenciador de Migrações de Banco de Dados{Colors.NC}")
-        print(f"{Colors.BLUE}🛡️ ==============================================={Colors.NC}")
-        print()
+        print(HEADER)
     
     def check_dependencies(self):
         """Verifica se as dependências estão instaladas"""
@@ -73,33 +94,47 @@ class MigrationManager:
         
         self.backup_dir.mkdir(exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = self.backup_dir / f"db_backup_{timestamp}.sqlite"
+        backup_file = self.backup_dir / f"{BACKUP_PREFIX}{timestamp}{BACKUP_SUFFIX}"
         
         try:
-            shutil.copy2(self.db_file, backup_file)
+            # API de backup online do SQLite: copia as páginas do banco em C, de forma
+            # consistente mesmo com outra conexão aberta. Um hardlink não serviria como
+            # backup, pois o SQLite altera o arquivo no próprio lugar.
+            source = sqlite3.connect(self.db_file)
+            try:
+                target = sqlite3.connect(backup_file)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+            finally:
+                source.close()
             print(f"{Colors.GREEN}✅ Backup criado: {backup_file}{Colors.NC}")
+            self._prune_backups(SECURITY_CONFIG['max_backups_to_keep'])
             return backup_file
         except Exception as e:
             print(f"{Colors.RED}❌ Erro ao criar backup: {e}{Colors.NC}")
             return None
     
-    def run_alembic(self, command: str, args: Optional[List[str]] = None) -> bool:
-        """Executa comandos do alembic"""
-        if args is None:
-            args = []
+    def get_alembic_config(self):
+        """Retorna a configuração do Alembic, carregada uma única vez por instância"""
+        if self._alembic_cfg is None:
+            from alembic.config import Config
+            self._alembic_cfg = Config(str(self.alembic_ini))
+        return self._alembic_cfg
+    
+    def run_alembic(self, command: str, *args, **kwargs) -> bool:
+        """Executa comandos do alembic pela API Python (alembic.command), no próprio processo"""
+        from alembic import command as alembic_command
         
-        cmd = ["alembic", "-c", str(self.alembic_ini), command] + args
-        print(f"{Colors.BLUE}🔄 Executando: {' '.join(cmd)}{Colors.NC}")
+        print(f"{Colors.BLUE}🔄 Executando: alembic {' '.join([command, *map(str, args)])}{Colors.NC}")
         
         try:
-            result = subprocess.run(cmd, check=True, capture_output=False)
-            return result.returncode == 0
-        except subprocess.CalledProcessError as e:
+            getattr(alembic_command, command)(self.get_alembic_config(), *args, **kwargs)
+            return True
+        except Exception as e:
             print(f"{Colors.RED}❌ Erro ao executar comando: {e}{Colors.NC}")
             return False
-        except FileNotFoundError:
-            print(f"{Colors.RED}❌ Alembic não encontrado no PATH{Colors.NC}")
-            return False
     
     def init_alembic(self):
         """Inicializa o Alembic"""
@@ -113,7 +148,7 @@ class MigrationManager:
                 print(f"{Colors.YELLOW}❌ Operação cancelada{Colors.NC}")
                 return
         
-        if self.run_alembic("init", [str(self.migrations_dir)]):
+        if self.run_alembic("init", str(self.migrations_dir)):
             print(f"{Colors.GREEN}✅ Alembic inicializado!{Colors.NC}")
         else:
             print(f"{Colors.RED}❌ Falha ao inicializar Alembic{Colors.NC}")
@@ -128,10 +163,7 @@ class MigrationManager:
         
         self.backup_database()
         
-        args = ["--autogenerate"] if autogenerate else []
-        args.extend(["-m", message])
-        
-        if self.run_alembic("revision", args):
+        if self.run_alembic("revision", message=message, autogenerate=autogenerate):
             print(f"{Colors.GREEN}✅ Migração criada!{Colors.NC}")
         else:
             print(f"{Colors.RED}❌ Falha ao criar migração{Colors.NC}")
@@ -142,7 +174,7 @@ class MigrationManager:
         
         self.backup_database()
         
-        if self.run_alembic("upgrade", [target]):
+        if self.run_alembic("upgrade", target):
             print(f"{Colors.GREEN}✅ Migrações aplicadas!{Colors.NC}")
         else:
             print(f"{Colors.RED}❌ Falha ao aplicar migrações{Colors.NC}")
@@ -153,7 +185,7 @@ class MigrationManager:
         
         self.backup_database()
         
-        if self.run_alembic("downgrade", [target]):
+        if self.run_alembic("downgrade", target):
             print(f"{Colors.GREEN}✅ Migrações revertidas!{Colors.NC}")
         else:
             print(f"{Colors.RED}❌ Falha ao reverter migrações{Colors.NC}")
@@ -166,12 +198,12 @@ class MigrationManager:
     def show_history(self):
         """Mostra histórico de migrações"""
         print(f"{Colors.BLUE}📜 Histórico de migrações:{Colors.NC}")
-        self.run_alembic("history", ["--verbose"])
+        self.run_alembic("history", verbose=True)
     
     def show_status(self):
         """Mostra status das migrações"""
         print(f"{Colors.BLUE}📊 Status das migrações:{Colors.NC}")
-        self.run_alembic("show", ["head"])
+        self.run_alembic("show", "head")
         print()
         print(f"{Colors.BLUE}📍 Migração atual:{Colors.NC}")
         self.run_alembic("current")
@@ -190,34 +222,56 @@ class MigrationManager:
         print(f"{Colors.BLUE}🔄 Fazendo reset completo...{Colors.NC}")
         
         # Downgrade para base
-        if self.run_alembic("downgrade", ["base"]):
+        if self.run_alembic("downgrade", "base"):
             # Remove banco
             if self.db_file.exists():
                 self.db_file.unlink()
             
             # Upgrade para head
-            if self.run_alembic("upgrade", ["head"]):
+            if self.run_alembic("upgrade", "head"):
                 print(f"{Colors.GREEN}✅ Reset completo realizado!{Colors.NC}")
             else:
                 print(f"{Colors.RED}❌ Falha no upgrade após reset{Colors.NC}")
         else:
             print(f"{Colors.RED}❌ Falha no downgrade{Colors.NC}")
     
-    def list_backups(self):
-        """Lista backups disponíveis"""
+    def _scan_backups(self) -> List[os.DirEntry]:
+        """Varre o diretório de backups uma única vez (os.scandir guarda o stat de cada entrada)"""
         if not self.backup_dir.exists():
-            print(f"{Colors.YELLOW}📁 Nenhum backup encontrado{Colors.NC}")
+            return []
+        
+        with os.scandir(self.backup_dir) as entries:
+            return [
+                entry for entry in entries
+                if entry.name.startswith(BACKUP_PREFIX) and entry.name.endswith(BACKUP_SUFFIX) and entry.is_file()
+            ]
+    
+    def _prune_backups(self, keep: int):
+        """Remove os backups mais antigos, mantendo apenas os `keep` mais recentes"""
+        backups = self._scan_backups()
+        if len(backups) <= keep:
             return
         
-        backups = list(self.backup_dir.glob("db_backup_*.sqlite"))
+        backups.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in backups[keep:]:
+            try:
+                os.unlink(entry.path)
+                print(f"{Colors.YELLOW}🗑️  Backup antigo removido: {entry.name}{Colors.NC}")
+            except OSError as e:
+                print(f"{Colors.RED}❌ Erro ao remover backup {entry.name}: {e}{Colors.NC}")
+    
+    def list_backups(self):
+        """Lista backups disponíveis"""
+        backups = self._scan_backups()
         if not backups:
             print(f"{Colors.YELLOW}📁 Nenhum backup encontrado{Colors.NC}")
             return
         
         print(f"{Colors.BLUE}📁 Backups disponíveis:{Colors.NC}")
-        for backup in sorted(backups, reverse=True):
-            size = backup.stat().st_size / 1024  # KB
-            mtime = datetime.fromtimestamp(backup.stat().st_mtime)
+        for backup in sorted(backups, key=lambda entry: entry.name, reverse=True):
+            stat = backup.stat()
+            size = stat.st_size / 1024  # KB
+            mtime = datetime.fromtimestamp(stat.st_mtime)
             print(f"  {Colors.GREEN}•{Colors.NC} {backup.name} ({size:.1f}KB) - {mtime.strftime('%d/%m/%Y %H:%M:%S')}")
     
     def restore_backup(self, backup_name: Optional[str] = None):
@@ -294,10 +348,10 @@ def create_parser():
     return parser
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Função principal"""
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     manager = MigrationManager()
     manager.show_header()
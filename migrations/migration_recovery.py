@@ -8,25 +8,36 @@ existente com o sistema de controle de migrações.
 """
 
 import os
+import re
 import sys
 import sqlite3
 import argparse
 import datetime
-import shutil
 from pathlib import Path
 
 # Importar configurações
 from migration_config import DATABASE_CONFIG, DIRECTORIES, SECURITY_CONFIG
 
+# Declaração da revisão em um arquivo de migração: `revision = '...'` ou `revision: str = '...'`
+REVISION_PATTERN = re.compile(rb"^revision\s*(?::[^=\n]+)?=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
 
-def get_db_tables(db_path):
-    """Obtém a lista de tabelas existentes no banco SQLite"""
-    if not os.path.exists(db_path):
+# A declaração da revisão fica no início do arquivo; basta ler este trecho
+REVISION_HEADER_SIZE = 8192
+
+
+def get_db_tables(db_path, conn=None):
+    """
+    Obtém a lista de tabelas existentes no banco SQLite
+    
+    Se `conn` for informado, a conexão é reutilizada e não é fechada ao final.
+    """
+    if conn is None and not os.path.exists(db_path):
         return []
     
-    conn = None
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
         # Consulta para obter todas as tabelas (exceto sqlite_sequence)
@@ -42,29 +53,40 @@ def get_db_tables(db_path):
         print(f"❌ Erro ao consultar banco de dados: {e}")
         return []
     finally:
-        if conn:
+        if own_conn and conn:
             conn.close()
 
 
-def get_alembic_version():
-    """Verifica se a tabela alembic_version existe e obtém a versão"""
+def get_alembic_version(conn=None, known_tables=None):
+    """
+    Verifica se a tabela alembic_version existe e obtém a versão
+    
+    Se `conn` for informado, a conexão é reutilizada e não é fechada ao final.
+    Se `known_tables` (tabelas já lidas do banco) for informado, a existência
+    da tabela é verificada nele, sem consultar o sqlite_master novamente.
+    """
+    if known_tables is not None and 'alembic_version' not in known_tables:
+        return None
+    
     db_path = DATABASE_CONFIG['sqlite']['file']
-    if not os.path.exists(db_path):
+    if conn is None and not os.path.exists(db_path):
         return None
     
-    conn = None
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
         
         # Verificar se a tabela alembic_version existe
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='alembic_version'
-        """)
-        
-        if not cursor.fetchone():
-            return None
+        if known_tables is None:
+            cursor.execute("""
+                SELECT name FROM sqlite_master 
+                WHERE type='table' AND name='alembic_version'
+            """)
+            
+            if not cursor.fetchone():
+                return None
             
         # Obter a versão atual
         cursor.execute("SELECT version_num FROM alembic_version")
@@ -74,22 +96,55 @@ def get_alembic_version():
         print(f"❌ Erro ao consultar versão do Alembic: {e}")
         return None
     finally:
-        if conn:
+        if own_conn and conn:
             conn.close()
 
 
-def create_alembic_version_table(version_id):
-    """Cria a tabela alembic_version e define a versão atual"""
+def introspect_database(conn):
+    """
+    Obtém as tabelas do banco e a versão do Alembic com uma única varredura do sqlite_master
+    
+    Retorna:
+        tuple: (lista de tabelas, versão atual do Alembic ou None)
+    """
+    try:
+        tables = [
+            row[0] for row in conn.execute("""
+                SELECT name FROM sqlite_master 
+                WHERE type='table' AND name NOT LIKE 'sqlite_%'
+                ORDER BY name
+            """)
+        ]
+    except sqlite3.Error as e:
+        print(f"❌ Erro ao consultar banco de dados: {e}")
+        return [], None
+    
+    # A versão só é consultada se a tabela alembic_version estiver na lista
+    return tables, get_alembic_version(conn, known_tables=frozenset(tables))
+
+
+def create_alembic_version_table(version_id, conn=None):
+    """
+    Cria a tabela alembic_version e define a versão atual
+    
+    Se `conn` for informado, a conexão é reutilizada e não é fechada ao final.
+    """
     db_path = DATABASE_CONFIG['sqlite']['file']
-    if not os.path.exists(db_path):
+    if conn is None and not os.path.exists(db_path):
         print(f"❌ Banco de dados não encontrado: {db_path}")
         return False
     
-    conn = None
+    own_conn = conn is None
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = sqlite3.connect(db_path)
+        # Um único fsync por transação é suficiente para esta escrita
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
         
+        # Criação da tabela e gravação da versão em uma única transação
+        cursor.execute("BEGIN IMMEDIATE")
+        
         # Criar tabela alembic_version se não existir
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS alembic_version (
@@ -97,16 +152,9 @@ def create_alembic_version_table(version_id):
             )
         """)
         
-        # Verificar se já existe um registro
-        cursor.execute("SELECT COUNT(*) FROM alembic_version")
-        count = cursor.fetchone()[0]
-        
-        if count > 0:
-            # Atualizar versão existente
-            cursor.execute("UPDATE alembic_version SET version_num = ?", (version_id,))
-        else:
-            # Inserir nova versão
-            cursor.execute("INSERT INTO alembic_version (version_num) VALUES (?)", (version_id,))
+        # Substituir a versão existente (a tabela guarda um único registro)
+        cursor.execute("DELETE FROM alembic_version")
+        cursor.execute("INSERT INTO alembic_version (version_num) VALUES (?)", (version_id,))
         
         conn.commit()
         return True
@@ -116,14 +164,19 @@ def create_alembic_version_table(version_id):
             conn.rollback()
         return False
     finally:
-        if conn:
+        if own_conn and conn:
             conn.close()
 
 
-def backup_database():
-    """Cria um backup do banco de dados atual"""
+def backup_database(conn=None):
+    """
+    Cria um backup do banco de dados atual
+    
+    Se `conn` for informado, o backup é feito a partir da conexão já aberta,
+    sem verificar o arquivo nem abrir outra conexão, e ela não é fechada ao final.
+    """
     db_path = DATABASE_CONFIG['sqlite']['file']
-    if not os.path.exists(db_path):
+    if conn is None and not os.path.exists(db_path):
         print(f"⚠️ Banco de dados não encontrado para backup: {db_path}")
         return None
     
@@ -136,14 +189,28 @@ def backup_database():
     backup_prefix = DATABASE_CONFIG['sqlite']['backup_prefix']
     backup_file = os.path.join(backup_dir, f"{backup_prefix}{timestamp}.sqlite")
     
-    # Copiar o arquivo do banco para o backup
+    # Copiar o banco com a API de backup online do SQLite, que gera uma cópia
+    # consistente mesmo com o banco em uso
+    own_conn = conn is None
+    source = conn
     try:
-        shutil.copy2(db_path, backup_file)
+        if own_conn:
+            source = sqlite3.connect(db_path)
+        # Aplica o WAL pendente no arquivo principal antes da cópia
+        source.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        target = sqlite3.connect(backup_file)
+        try:
+            source.backup(target, pages=1024, sleep=0)
+        finally:
+            target.close()
         print(f"✅ Backup criado: {backup_file}")
         return backup_file
     except Exception as e:
         print(f"❌ Erro ao criar backup: {e}")
         return None
+    finally:
+        if own_conn and source:
+            source.close()
 
 
 def sync_database_with_migrations():
@@ -154,8 +221,19 @@ def sync_database_with_migrations():
         print(f"⚠️ Banco de dados não encontrado: {db_path}")
         return False
     
-    # Obter tabelas existentes
-    tables = get_db_tables(db_path)
+    # Uma única conexão para todas as consultas da sincronização
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB
+        return _sync_database_with_migrations(conn)
+    finally:
+        conn.close()
+
+
+def _sync_database_with_migrations(conn):
+    """Executa a sincronização usando a conexão informada"""
+    # Obter tabelas existentes e a versão do Alembic
+    tables, current_version = introspect_database(conn)
     if not tables:
         print("⚠️ Banco de dados vazio ou inacessível")
         return False
@@ -163,7 +241,6 @@ def sync_database_with_migrations():
     print(f"📊 Tabelas encontradas no banco: {', '.join(tables)}")
     
     # Verificar se já existe controle de versão do Alembic
-    current_version = get_alembic_version()
     if current_version:
         print(f"✅ Controle de versão do Alembic já existe: {current_version}")
         return True
@@ -177,39 +254,41 @@ def sync_database_with_migrations():
         print(f"❌ Diretório de versões não encontrado: {versions_dir}")
         return False
     
-    # Encontrar a migração mais recente (assumindo que o arquivo com 'initial' é o inicial)
-    migration_files = [f for f in os.listdir(versions_dir) if f.endswith('.py') and not f.startswith('__')]
+    # Procurar a migração inicial (assumindo que o arquivo com 'initial' é o inicial)
+    # em uma única passada pelo diretório, parando no primeiro arquivo válido
+    has_migrations = False
+    initial_migration = None
+    with os.scandir(versions_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.py') or name.startswith('__'):
+                continue
+            has_migrations = True
+            
+            if 'initial' in name.lower():
+                with open(entry.path, 'rb') as f:
+                    # Extrair a revision ID
+                    match = REVISION_PATTERN.search(f.read(REVISION_HEADER_SIZE))
+                if match:
+                    initial_migration = match.group(1).decode()
+                    break
     
-    if not migration_files:
+    if not has_migrations:
         print("❌ Nenhum arquivo de migração encontrado")
         return False
     
-    # Procurar a migração inicial
-    initial_migration = None
-    for file in migration_files:
-        if 'initial' in file.lower():
-            with open(os.path.join(versions_dir, file), 'r') as f:
-                content = f.read()
-                # Extrair a revision ID
-                for line in content.split('\n'):
-                    if line.startswith('revision = '):
-                        initial_migration = line.split('=')[1].strip().strip("'\"")
-                        break
-            if initial_migration:
-                break
-    
     if not initial_migration:
         print("❌ Não foi possível identificar a migração inicial")
         return False
     
-    # Criar backup antes de modificar
-    backup = backup_database()
+    # Criar backup antes de modificar, reutilizando a conexão aberta
+    backup = backup_database(conn)
     if not backup:
         print("⚠️ Não foi possível criar backup, operação cancelada")
         return False
     
     # Criar a tabela alembic_version e definir a versão
-    if create_alembic_version_table(initial_migration):
+    if create_alembic_version_table(initial_migration, conn):
         print(f"✅ Banco sincronizado com a migração inicial: {initial_migration}")
         return True
     else:
@@ -217,11 +296,17 @@ def sync_database_with_migrations():
         return False
 
 
-def main():
+def create_parser():
+    """Cria o parser de argumentos da linha de comando"""
     parser = argparse.ArgumentParser(description="🛡️ SalasTech Migration Recovery")
     parser.add_argument('--sync', action='store_true', help="Sincronizar banco existente com migrações")
     parser.add_argument('--force', action='store_true', help="Forçar operação sem confirmação")
     parser.add_argument('--version', type=str, help="Versão específica para definir")
+    return parser
+
+
+def main():
+    parser = create_parser()
     args = parser.parse_args()
     
     print("🛡️ ===============================================")
@@ -6,16 +6,50 @@ Script para marcar migrações como já aplicadas sem executá-las.
 
 import sys
 import argparse
+from functools import lru_cache
 from pathlib import Path
 
 # Adicionar diretório do projeto ao path para importações
 project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+# Arquivo de configuração do Alembic
+ALEMBIC_INI = Path(__file__).parent / "alembic.ini"
 
 from alembic import command
 from alembic.config import Config
 
 
+@lru_cache(maxsize=1)
+def get_alembic_config():
+    """Carrega a configuração do Alembic uma única vez por processo"""
+    return Config(str(ALEMBIC_INI))
+
+
+def stamp_revisions(revisions, sql=False, tag=None):
+    """
+    Marca uma ou mais revisões como aplicadas sem executar as migrações.
+    
+    As revisões são marcadas em ordem, reutilizando a mesma configuração
+    do Alembic em vez de reler o alembic.ini a cada revisão.
+    
+    Args:
+        revisions: Lista de IDs de revisão (ou 'head' para a mais recente)
+        sql: Se True, apenas imprime o SQL que seria executado
+        tag: Tag opcional para a operação
+    """
+    alembic_cfg = get_alembic_config()
+    
+    for revision in revisions:
+        print(f"🔖 Marcando migração '{revision}' como aplicada...")
+        
+        # Executar o comando stamp
+        command.stamp(alembic_cfg, revision, sql=sql, tag=tag)
+        
+        print("✅ Migração marcada com sucesso!")
+
+
 def stamp_revision(revision='head', sql=False, tag=None):
     """
     Marca uma revisão como aplicada sem executar a migração.
@@ -25,28 +59,20 @@ def stamp_revision(revision='head', sql=False, tag=None):
         sql: Se True, apenas imprime o SQL que seria executado
         tag: Tag opcional para a operação
     """
-    # Carregar configuração do Alembic
-    alembic_cfg = Config(str(Path(__file__).parent / "alembic.ini"))
-    
-    print(f"🔖 Marcando migração '{revision}' como aplicada...")
-    
-    # Executar o comando stamp
-    command.stamp(alembic_cfg, revision, sql=sql, tag=tag)
-    
-    print("✅ Migração marcada com sucesso!")
+    stamp_revisions([revision], sql=sql, tag=tag)
 
 
 def main():
     """Função principal"""
     parser = argparse.ArgumentParser(description="Marca migrações como aplicadas sem executá-las")
-    parser.add_argument("revision", nargs="?", default="head", 
-                      help="ID da revisão ou 'head' para a mais recente (padrão)")
+    parser.add_argument("revisions", nargs="*", default=["head"], metavar="revision",
+                      help="IDs das revisões ou 'head' para a mais recente (padrão)")
     parser.add_argument("--sql", action="store_true", help="Apenas imprimir o SQL (não executar)")
     parser.add_argument("--tag", help="Tag opcional para a operação")
     
     args = parser.parse_args()
     
-    stamp_revision(args.revision, args.sql, args.tag)
+    stamp_revisions(args.revisions, args.sql, args.tag)
 
 
 if __name__ == "__main__":
@@ -12,10 +12,12 @@ Este script oferece um menu interativo para gerenciar administradores do sistema
 """
 
 import os
+import re
 import sys
 import secrets
 import string
 import getpass
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
@@ -23,12 +25,41 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy import func, literal, select, text, tuple_, update
+from sqlalchemy.exc import DisconnectionError, OperationalError
 from sqlalchemy.orm import Session
 from app.core.db_context import SessionLocal
 from app.core.security.password import PasswordManager
 from app.models.db import UsuarioDb
 from app.models.enums import UserRole
 
+# Quantidade de usuários exibidos por página na listagem
+USERS_PAGE_SIZE = 50
+
+# Ícone exibido para cada papel na listagem de usuários
+ROLE_ICONS = {
+    UserRole.ADMIN: "👑",
+    UserRole.GESTOR: "👔",
+    UserRole.USUARIO_AVANCADO: "🔧",
+    UserRole.USER: "👤",
+}
+
+# Opções do menu de alteração de papel: tecla -> (papel, descrição)
+ROLE_OPTIONS = {
+    '1': (UserRole.USER, "👤 Usuário"),
+    '2': (UserRole.GESTOR, "👔 Gestor"),
+    '3': (UserRole.ADMIN, "👑 Administrador"),
+    '4': (UserRole.USUARIO_AVANCADO, "🔧 Usuário Avançado")
+}
+
+# Formato aceito para emails: algo@dominio.tld, sem espaços
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Caracteres usados nas senhas aleatórias
+PASSWORD_ALPHABET = string.ascii_letters + string.digits + "!@#$%&*"
+# Bytes a partir deste valor são descartados para que todos os caracteres tenham a mesma chance
+PASSWORD_BYTE_LIMIT = 256 - 256 % len(PASSWORD_ALPHABET)
+
 
 def clear_screen():
     """Limpa a tela do terminal"""
@@ -47,13 +78,20 @@ def print_header():
 
 def generate_random_password(length=12):
     """Gera uma senha aleatória segura"""
-    characters = string.ascii_letters + string.digits + "!@#$%&*"
-    return ''.join(secrets.choice(characters) for _ in range(length))
+    # Bytes aleatórios em bloco, mapeados direto para o alfabeto
+    characters = []
+    while len(characters) < length:
+        characters.extend(
+            PASSWORD_ALPHABET[b % len(PASSWORD_ALPHABET)]
+            for b in secrets.token_bytes(length)
+            if b < PASSWORD_BYTE_LIMIT
+        )
+    return ''.join(characters[:length])
 
 
 def validate_email(email):
     """Validação básica de email"""
-    return "@" in email and "." in email.split("@")[1]
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def get_input_with_validation(prompt, validator=None, error_msg="Entrada inválida!", allow_empty=False):
@@ -123,33 +161,125 @@ def get_password_choice(current_password=None):
 
 
 def list_all_users(db, filter_role=None):
-    """Lista usuários com filtro opcional por papel"""
-    query = db.query(UsuarioDb)
+    """
+    Lista usuários com filtro opcional por papel
+    
+    Apenas as colunas exibidas são buscadas, em páginas de USERS_PAGE_SIZE
+    linhas (paginação por chave: nome, sobrenome, id). A próxima página só é
+    consultada se o usuário pedir, então a primeira aparece sem carregar a tabela inteira.
     
-    if filter_role:
-        query = query.filter(UsuarioDb.papel == filter_role)
+    Returns:
+        Dicionário {número exibido: id do usuário} das linhas exibidas
+    """
+    conditions = [UsuarioDb.papel == filter_role] if filter_role else []
     
-    users = query.order_by(UsuarioDb.nome, UsuarioDb.sobrenome).all()
+    total = db.execute(select(func.count(UsuarioDb.id)).where(*conditions)).scalar_one()
     
-    if not users:
+    if not total:
         role_text = f" {filter_role.value}s" if filter_role else ""
         print(f"📭 Nenhum usuário{role_text} encontrado.")
-        return []
+        return {}
     
-    print(f"\n👥 {'Administradores' if filter_role == UserRole.ADMIN else 'Usuários'} ({len(users)}):")
+    print(f"\n👥 {'Administradores' if filter_role == UserRole.ADMIN else 'Usuários'} ({total}):")
     print("-" * 80)
     
-    for i, user in enumerate(users, 1):
-        status = "🟢 Ativo" if getattr(user, 'ativo', True) else "🔴 Inativo"
-        role_icon = {"ADMIN": "👑", "MANAGER": "👔", "USER": "👤"}.get(user.papel.name, "❓")
+    sort_key = tuple_(UsuarioDb.nome, UsuarioDb.sobrenome, UsuarioDb.id)
+    query = (
+        select(
+            UsuarioDb.id,
+            UsuarioDb.nome,
+            UsuarioDb.sobrenome,
+            UsuarioDb.email,
+            UsuarioDb.papel,
+            UsuarioDb.criado_em,
+        )
+        .where(*conditions)
+        .order_by(UsuarioDb.nome, UsuarioDb.sobrenome, UsuarioDb.id)
+        .limit(USERS_PAGE_SIZE)
+    )
+    
+    # Apenas o número exibido e o id ficam em memória para a seleção
+    id_map = {}
+    page_query = query
+    while True:
+        page = db.execute(page_query).all()
+        
+        for i, user in enumerate(page, len(id_map) + 1):
+            id_map[i] = user.id
+            status = "🟢 Ativo" if getattr(user, 'ativo', True) else "🔴 Inativo"
+            role_icon = ROLE_ICONS.get(user.papel, "❓")
+            
+            print(f"{i:2}. {role_icon} {user.nome} {user.sobrenome}")
+            print(f"    📧 {user.email}")
+            print(f"    🆔 ID: {user.id} | 👑 {user.papel.value} | {status}")
+            print(f"    📅 Criado: {user.criado_em.strftime('%d/%m/%Y %H:%M')}")
+            print("-" * 80)
+        
+        if len(page) < USERS_PAGE_SIZE or len(id_map) >= total:
+            break
+        
+        more = input(f"\n➡️  Exibindo {len(id_map)} de {total}. ENTER para mais, ou 'p' para parar: ").strip().lower()
+        if more == 'p':
+            break
         
-        print(f"{i:2}. {role_icon} {user.nome} {user.sobrenome}")
-        print(f"    📧 {user.email}")
-        print(f"    🆔 ID: {user.id} | 👑 {user.papel.value} | {status}")
-        print(f"    📅 Criado: {user.criado_em.strftime('%d/%m/%Y %H:%M')}")
-        print("-" * 80)
+        # Continuar a partir do último usuário exibido
+        last = page[-1]
+        page_query = query.where(sort_key > tuple_(last.nome, last.sobrenome, last.id))
+    
+    return id_map
+
+
+def select_user(db, filter_role=None, label="um usuário"):
+    """
+    Lista os usuários e pede a escolha de um deles pelo número exibido
+    
+    Apenas o usuário escolhido é carregado como entidade, pela chave primária.
+    
+    Returns:
+        O usuário escolhido, ou None se não houver usuários para escolher
+    """
+    id_map = list_all_users(db, filter_role=filter_role)
+    if not id_map:
+        return None
+    
+    while True:
+        try:
+            choice = int(input(f"\n🎯 Escolha {label} (1-{len(id_map)}): "))
+            if choice in id_map:
+                break
+            else:
+                print("❌ Número inválido!")
+        except ValueError:
+            print("❌ Digite um número válido!")
     
-    return users
+    user = db.get(UsuarioDb, id_map[choice])
+    if user is None:
+        print("❌ Usuário não encontrado!")
+    return user
+
+
+def email_in_use(db, email, exclude_id=None):
+    """Verifica se o email já está em uso, consultando apenas a existência pelo índice único"""
+    query = select(literal(1)).where(UsuarioDb.email == email)
+    if exclude_id is not None:
+        query = query.where(UsuarioDb.id != exclude_id)
+    return db.execute(query.limit(1)).first() is not None
+
+
+@contextmanager
+def atomic(db: Session):
+    """Agrupa as alterações de uma ação em uma única transação (COMMIT ao final, ROLLBACK em caso de erro)"""
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def update_user_fields(db, user_id, **values):
+    """Atualiza apenas as colunas informadas com um único UPDATE pela chave primária"""
+    db.execute(update(UsuarioDb).where(UsuarioDb.id == user_id).values(**values))
 
 
 def create_admin_user(db):
@@ -167,8 +297,7 @@ def create_admin_user(db):
     )
     
     # Verificar se email já existe
-    existing_user = db.query(UsuarioDb).filter(UsuarioDb.email == email).first()
-    if existing_user:
+    if email_in_use(db, email):
         print(f"\n❌ ERRO: Já existe um usuário com o email '{email}'!")
         return False
     
@@ -198,8 +327,8 @@ def create_admin_user(db):
             papel=UserRole.ADMIN
         )
         
-        db.add(admin_user)
-        db.commit()
+        with atomic(db):
+            db.add(admin_user)
         db.refresh(admin_user)
         
         print(f"\n✅ Administrador criado com sucesso!")
@@ -210,7 +339,6 @@ def create_admin_user(db):
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erro ao criar administrador: {e}")
         return False
 
@@ -220,23 +348,11 @@ def change_user_password(db):
     print("\n🔄 Alterar Senha de Usuário")
     print("=" * 30)
     
-    # Listar usuários
-    users = list_all_users(db)
-    if not users:
+    # Listar usuários e selecionar
+    user = select_user(db)
+    if not user:
         return False
     
-    # Selecionar usuário
-    while True:
-        try:
-            choice = int(input(f"\n🎯 Escolha um usuário (1-{len(users)}): "))
-            if 1 <= choice <= len(users):
-                user = users[choice - 1]
-                break
-            else:
-                print("❌ Número inválido!")
-        except ValueError:
-            print("❌ Digite um número válido!")
-    
     print(f"\n👤 Usuário selecionado: {user.nome} {user.sobrenome} ({user.email})")
     
     # Obter nova senha
@@ -251,8 +367,8 @@ def change_user_password(db):
         return False
     
     try:
-        user.senha = PasswordManager.hash_password(nova_senha)
-        db.commit()
+        with atomic(db):
+            update_user_fields(db, user.id, senha=PasswordManager.hash_password(nova_senha))
         
         print(f"\n✅ Senha alterada com sucesso!")
         print(f"   👤 Usuário: {user.nome} {user.sobrenome}")
@@ -262,7 +378,6 @@ def change_user_password(db):
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erro ao alterar senha: {e}")
         return False
 
@@ -272,23 +387,11 @@ def update_user_info(db):
     print("\n✏️ Atualizar Dados do Usuário")
     print("=" * 30)
     
-    # Listar usuários
-    users = list_all_users(db)
-    if not users:
+    # Listar usuários e selecionar
+    user = select_user(db)
+    if not user:
         return False
     
-    # Selecionar usuário
-    while True:
-        try:
-            choice = int(input(f"\n🎯 Escolha um usuário (1-{len(users)}): "))
-            if 1 <= choice <= len(users):
-                user = users[choice - 1]
-                break
-            else:
-                print("❌ Número inválido!")
-        except ValueError:
-            print("❌ Digite um número válido!")
-    
     print(f"\n👤 Editando: {user.nome} {user.sobrenome} ({user.email})")
     print("💡 Deixe em branco para manter o valor atual")
     
@@ -299,8 +402,7 @@ def update_user_info(db):
     
     # Verificar se novo email já existe
     if email != user.email:
-        existing = db.query(UsuarioDb).filter(UsuarioDb.email == email, UsuarioDb.id != user.id).first()
-        if existing:
+        if email_in_use(db, email, exclude_id=user.id):
             print(f"❌ Email '{email}' já está em uso!")
             return False
     
@@ -322,16 +424,19 @@ def update_user_info(db):
         return False
     
     try:
-        user.nome = nome
-        user.sobrenome = sobrenome
-        user.email = email
-        db.commit()
+        # Apenas os campos alterados entram no UPDATE
+        changes = {
+            field: value
+            for field, value in (('nome', nome), ('sobrenome', sobrenome), ('email', email))
+            if value != getattr(user, field)
+        }
+        with atomic(db):
+            update_user_fields(db, user.id, **changes)
         
         print(f"\n✅ Dados atualizados com sucesso!")
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erro ao atualizar dados: {e}")
         return False
 
@@ -341,43 +446,24 @@ def change_user_role(db):
     print("\n👑 Alterar Papel do Usuário")
     print("=" * 30)
     
-    # Listar usuários não-admin
-    users = list_all_users(db)
-    if not users:
+    # Listar usuários não-admin e selecionar
+    user = select_user(db)
+    if not user:
         return False
     
-    # Selecionar usuário
-    while True:
-        try:
-            choice = int(input(f"\n🎯 Escolha um usuário (1-{len(users)}): "))
-            if 1 <= choice <= len(users):
-                user = users[choice - 1]
-                break
-            else:
-                print("❌ Número inválido!")
-        except ValueError:
-            print("❌ Digite um número válido!")
-    
     print(f"\n� Usuário: {user.nome} {user.sobrenome}")
     print(f"👑 Papel atual: {user.papel.value}")
     
     # Mostrar opções de papel
-    roles = {
-        '1': (UserRole.USER, "👤 Usuário"),
-        '2': (UserRole.GESTOR, "👔 Gestor"),
-        '3': (UserRole.ADMIN, "👑 Administrador"),
-        '4': (UserRole.USUARIO_AVANCADO, "🔧 Usuário Avançado")
-    }
-    
     print("\n🎭 Papéis disponíveis:")
-    for key, (role, desc) in roles.items():
+    for key, (role, desc) in ROLE_OPTIONS.items():
         current = " (ATUAL)" if role == user.papel else ""
         print(f"   {key}. {desc}{current}")
     
     while True:
         choice = input("\n🎯 Escolha o novo papel (1/2/3): ").strip()
-        if choice in roles:
-            new_role, role_desc = roles[choice]
+        if choice in ROLE_OPTIONS:
+            new_role, role_desc = ROLE_OPTIONS[choice]
             break
         print("❌ Opção inválida!")
     
@@ -394,8 +480,8 @@ def change_user_role(db):
         return False
     
     try:
-        user.papel = new_role
-        db.commit()
+        with atomic(db):
+            update_user_fields(db, user.id, papel=new_role)
         
         print(f"\n✅ Papel alterado com sucesso!")
         print(f"   👤 {user.nome} {user.sobrenome}")
@@ -404,7 +490,6 @@ def change_user_role(db):
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erro ao alterar papel: {e}")
         return False
 
@@ -412,23 +497,33 @@ def change_user_role(db):
 def save_credentials_file(user_data, password):
     """Salva credenciais em arquivo"""
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"admin_credentials_{user_data['id']}_{timestamp}.txt"
         
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write("🛡️ SalasTech - Credenciais de Administrador\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"🌐 URL do Painel: http://localhost:8000/admin\n")
-            f.write(f"📧 Email: {user_data['email']}\n")
-            f.write(f"🔑 Senha: {password}\n")
-            f.write(f"👤 Nome: {user_data['nome']} {user_data['sobrenome']}\n")
-            f.write(f"🆔 ID: {user_data['id']}\n")
-            f.write(f"👑 Papel: {user_data['papel']}\n")
-            f.write(f"📅 Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n\n")
-            f.write("⚠️  IMPORTANTE:\n")
-            f.write("- Guarde este arquivo em local seguro\n")
-            f.write("- Delete este arquivo após anotar as credenciais\n")
-            f.write("- Altere a senha após o primeiro login\n")
+        conteudo = "\n".join([
+            "🛡️ SalasTech - Credenciais de Administrador",
+            "=" * 50,
+            "",
+            "🌐 URL do Painel: http://localhost:8000/admin",
+            f"📧 Email: {user_data['email']}",
+            f"🔑 Senha: {password}",
+            f"👤 Nome: {user_data['nome']} {user_data['sobrenome']}",
+            f"🆔 ID: {user_data['id']}",
+            f"👑 Papel: {user_data['papel']}",
+            f"📅 Gerado em: {now.strftime('%d/%m/%Y %H:%M:%S')}",
+            "",
+            "⚠️  IMPORTANTE:",
+            "- Guarde este arquivo em local seguro",
+            "- Delete este arquivo após anotar as credenciais",
+            "- Altere a senha após o primeiro login",
+            "",
+        ])
+        
+        # Arquivo novo, legível apenas pelo dono, gravado com uma única escrita
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(conteudo)
         
         print(f"💾 Credenciais salvas em: {filename}")
         return True
@@ -451,72 +546,96 @@ def show_main_menu():
     print()
 
 
+def open_session():
+    """Abre a sessão do banco e verifica a conexão uma única vez"""
+    db = SessionLocal()
+    try:
+        # Teste básico de conexão
+        db.execute(text("SELECT 1"))
+    except Exception:
+        db.close()
+        raise
+    return db
+
+
 def main():
     """Função principal do gerenciador"""
-    while True:
-        print_header()
-        
-        # Verificar conexão com banco
-        try:
-            db = SessionLocal()
-            # Teste básico de conexão
-            from sqlalchemy import text
-            db.execute(text("SELECT 1"))
-        except Exception as e:
-            print(f"❌ Erro de conexão com banco de dados: {e}")
-            print("🔧 Verifique se o banco está configurado corretamente.")
-            input("\n📋 Pressione ENTER para tentar novamente...")
-            continue
-        
-        show_main_menu()
-        
-        choice = "0"  # Valor padrão
-        try:
-            choice = input("🎯 Escolha uma opção (0-7): ").strip()
+    # A mesma sessão é reutilizada por todas as ações do menu e só é
+    # recriada se a conexão com o banco for perdida
+    db = None
+    try:
+        while True:
+            print_header()
             
-            if choice == "0":
-                print("\n👋 Obrigado por usar o SalasTech Admin Manager!")
-                print("🛡️ Mantenha sempre suas credenciais seguras!")
-                break
+            # Verificar conexão com banco
+            if db is None:
+                try:
+                    db = open_session()
+                except Exception as e:
+                    print(f"❌ Erro de conexão com banco de dados: {e}")
+                    print("🔧 Verifique se o banco está configurado corretamente.")
+                    input("\n📋 Pressione ENTER para tentar novamente...")
+                    continue
             
-            elif choice == "1":
-                create_admin_user(db)
-                
-            elif choice == "2":
-                list_all_users(db)
+            show_main_menu()
+            
+            choice = "0"  # Valor padrão
+            try:
+                choice = input("🎯 Escolha uma opção (0-7): ").strip()
                 
-            elif choice == "3":
-                list_all_users(db, filter_role=UserRole.ADMIN)
+                if choice == "0":
+                    print("\n👋 Obrigado por usar o SalasTech Admin Manager!")
+                    print("🛡️ Mantenha sempre suas credenciais seguras!")
+                    break
                 
-            elif choice == "4":
-                change_user_password(db)
+                elif choice == "1":
+                    create_admin_user(db)
+                    
+                elif choice == "2":
+                    list_all_users(db)
+                    
+                elif choice == "3":
+                    list_all_users(db, filter_role=UserRole.ADMIN)
+                    
+                elif choice == "4":
+                    change_user_password(db)
+                    
+                elif choice == "5":
+                    update_user_info(db)
+                    
+                elif choice == "6":
+                    change_user_role(db)
+                    
+                elif choice == "7":
+                    save_credentials_menu(db)
+                    
+                else:
+                    print("❌ Opção inválida! Escolha um número de 0 a 7.")
                 
-            elif choice == "5":
-                update_user_info(db)
+            except KeyboardInterrupt:
+                print("\n\n🛑 Operação cancelada pelo usuário.")
                 
-            elif choice == "6":
-                change_user_role(db)
+            except (OperationalError, DisconnectionError) as e:
+                print(f"\n❌ Conexão com o banco perdida: {e}")
+                db.close()
+                db = None
                 
-            elif choice == "7":
-                save_credentials_menu(db)
+            except Exception as e:
+                print(f"\n❌ Erro inesperado: {e}")
                 
-            else:
-                print("❌ Opção inválida! Escolha um número de 0 a 7.")
-            
-        except KeyboardInterrupt:
-            print("\n\n🛑 Operação cancelada pelo usuário.")
+            finally:
+                # Encerra a transação da ação para que a próxima leia dados atualizados
+                if db is not None:
+                    try:
+                        db.rollback()
+                    except:
+                        pass
             
-        except Exception as e:
-            print(f"\n❌ Erro inesperado: {e}")
-            
-        finally:
-            try:
-                db.close()
-            except:
-                pass
-        
-        if choice != "0":
-            input("\n📋 Pressione ENTER para continuar...")
+            if choice != "0":
+                input("\n📋 Pressione ENTER para continuar...")
+    finally:
+        if db is not None:
+            db.close()
 
 
 def save_credentials_menu(db):
@@ -524,23 +643,11 @@ def save_credentials_menu(db):
     print("\n💾 Salvar Credenciais")
     print("=" * 25)
     
-    # Listar administradores
-    admins = list_all_users(db, filter_role=UserRole.ADMIN)
-    if not admins:
+    # Listar administradores e selecionar
+    admin = select_user(db, filter_role=UserRole.ADMIN, label="um administrador")
+    if not admin:
         return False
     
-    # Selecionar administrador
-    while True:
-        try:
-            choice = int(input(f"\n🎯 Escolha um administrador (1-{len(admins)}): "))
-            if 1 <= choice <= len(admins):
-                admin = admins[choice - 1]
-                break
-            else:
-                print("❌ Número inválido!")
-        except ValueError:
-            print("❌ Digite um número válido!")
-    
     print(f"\n👤 Administrador: {admin.nome} {admin.sobrenome}")
     print("⚠️  Para salvar as credenciais, será necessário definir uma nova senha.")
     
@@ -551,10 +658,6 @@ def save_credentials_menu(db):
         return False
     
     try:
-        # Atualizar senha no banco
-        admin.senha = PasswordManager.hash_password(senha)
-        db.commit()
-        
         # Preparar dados do usuário
         user_data = {
             'id': admin.id,
@@ -564,16 +667,19 @@ def save_credentials_menu(db):
             'papel': admin.papel.value
         }
         
-        # Salvar arquivo
-        if save_credentials_file(user_data, senha):
-            print(f"\n✅ Credenciais salvas e senha atualizada!")
-        else:
-            print(f"\n⚠️ Senha atualizada, mas erro ao salvar arquivo.")
+        with atomic(db):
+            # Atualizar senha no banco
+            update_user_fields(db, admin.id, senha=PasswordManager.hash_password(senha))
+            
+            # Salvar arquivo antes do COMMIT: se falhar, a senha não é alterada
+            if not save_credentials_file(user_data, senha):
+                raise OSError("não foi possível salvar o arquivo de credenciais")
+        
+        print(f"\n✅ Credenciais salvas e senha atualizada!")
         
         return True
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Erro ao atualizar senha: {e}")
         return False
 
@@ -250,3 +250,71 @@ class TestAuthAPI:
         
         response = client.get("/auth/me", headers=headers)
         assert response.status_code == 401
+
+
+@pytest.mark.integration
+class TestLoginRehash:
+    """Integration tests for the migration of legacy hashes on API login."""
+
+    @pytest.fixture
+    def login_client(self):
+        """TestClient bound to an isolated in-memory database."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        from app.core.db_context import get_db
+        from app.main import app
+        from app.models.db import Base
+
+        engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield TestClient(app), SessionLocal
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            engine.dispose()
+
+    def test_login_rehashes_bcrypt_password(self, login_client):
+        """Test that a successful login replaces a bcrypt hash with Argon2id."""
+        import bcrypt
+        from app.models.db import DepartamentoDb
+
+        client, SessionLocal = login_client
+        email = "legacy@example.com"
+        password = "testpassword123"
+
+        with SessionLocal() as db:
+            department = DepartamentoDb(nome="Test Department", codigo="TEST")
+            db.add(department)
+            db.flush()
+            db.add(UsuarioDb(
+                nome="Legacy",
+                sobrenome="User",
+                email=email,
+                senha=bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode(),
+                papel=UserRole.USER,
+                departamento_id=department.id,
+            ))
+            db.commit()
+
+        response = client.post("/auth/login", json={"email": email, "password": password})
+
+        assert response.status_code == 200
+        with SessionLocal() as db:
+            stored = db.query(UsuarioDb).filter(UsuarioDb.email == email).one().senha
+        assert stored.startswith("$argon2id$")
+        assert PasswordManager.verify_password(password, stored) is True
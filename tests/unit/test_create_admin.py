@@ -0,0 +1,64 @@
+"""
+Unit tests for the admin creation script.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.security.password import PasswordManager
+from app.models.db import Base, UsuarioDb
+from app.models.enums import UserRole
+from create_admin import create_admins_bulk
+
+
+@pytest.fixture
+def session():
+    """In-memory SQLite session with the full schema."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+class TestCreateAdminsBulk:
+    """Tests for the non-interactive bulk admin creation."""
+
+    @pytest.mark.parametrize("executemany_returning", [True, False])
+    def test_creates_admins(self, session, monkeypatch, executemany_returning):
+        """Test that all records are inserted as admins with hashed passwords.
+
+        The False case simulates dialects without executemany RETURNING (e.g. MySQL).
+        """
+        monkeypatch.setattr(
+            session.get_bind().dialect, "insert_executemany_returning", executemany_returning
+        )
+        records = [
+            {"nome": "Ana", "sobrenome": "Silva", "email": "ana@ifam.edu.br", "senha": "Senha@123"},
+            {"nome": "Bruno", "sobrenome": "Souza", "email": "bruno@ifam.edu.br", "senha": "Outra@456"},
+        ]
+
+        created = create_admins_bulk(session, records)
+
+        assert [row.email for row in created] == ["ana@ifam.edu.br", "bruno@ifam.edu.br"]
+        for row, record in zip(created, records):
+            assert row.id is not None
+            assert row.criado_em is not None
+            user = session.get(UsuarioDb, row.id)
+            assert user.papel == UserRole.ADMIN
+            assert user.senha != record["senha"]
+            assert PasswordManager.verify_password(record["senha"], user.senha) is True
+
+    def test_empty_input(self, session):
+        """Test that an empty list inserts nothing."""
+        assert create_admins_bulk(session, []) == []
+        assert session.query(UsuarioDb).count() == 0
@@ -0,0 +1,34 @@
+"""
+Unit tests for password hashing.
+"""
+
+import bcrypt
+
+from app.core.security.password import PasswordManager
+
+
+class TestPasswordManager:
+    """Tests for the Argon2id password manager."""
+
+    def test_hash_password_uses_argon2id(self):
+        """Test that new hashes are encoded as Argon2id."""
+        hashed = PasswordManager.hash_password("Senha@123")
+        assert hashed.startswith("$argon2id$")
+        assert not PasswordManager.needs_rehash(hashed)
+
+    def test_verify_password(self):
+        """Test verification of correct and incorrect passwords."""
+        hashed = PasswordManager.hash_password("Senha@123")
+        assert PasswordManager.verify_password("Senha@123", hashed) is True
+        assert PasswordManager.verify_password("outra-senha", hashed) is False
+
+    def test_verify_legacy_bcrypt_hash(self):
+        """Test that legacy bcrypt hashes still verify and are flagged for rehash."""
+        legacy = bcrypt.hashpw(b"Senha@123", bcrypt.gensalt()).decode("utf-8")
+        assert PasswordManager.verify_password("Senha@123", legacy) is True
+        assert PasswordManager.verify_password("outra-senha", legacy) is False
+        assert PasswordManager.needs_rehash(legacy) is True
+
+    def test_verify_invalid_hash(self):
+        """Test that malformed hashes are rejected instead of raising."""
+        assert PasswordManager.verify_password("Senha@123", "not-a-hash") is False